@@ -0,0 +1,7 @@
+import os
+
+from django.core.asgi import get_asgi_application  # Django >= 3.0
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+application = get_asgi_application()
@@ -0,0 +1,232 @@
+#! /usr/bin/env python
+"""
+Load test the tracked test project with concurrent clients.
+
+The project in tests/urls.py is served by Django's threaded development server,
+gunicorn (multi-worker WSGI) or uvicorn (multi-worker ASGI, Django >= 3.0), and
+driven by concurrent keep-alive HTTP clients. For each path, i.e. each
+persistence backend, it reports throughput, p50/p99 latency and the log write
+lag: how long after the last response all the logs are in the database.
+Everything runs locally, without network access.
+
+    $ ./benchmarks/loadtest.py --server gunicorn --workers 4 --clients 32 --output load.json
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from http.client import HTTPConnection
+except ImportError:  # Python 2
+    from httplib import HTTPConnection
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# path -> persistence backend
+PATHS = {
+    '/no-logging': 'none',
+    '/logging': 'LoggingMixin',
+    '/queued-logging': 'QueuedLoggingMixin',
+}
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def server_command(server, port, workers, threads):
+    address = '127.0.0.1:{}'.format(port)
+    if server == 'runserver':
+        return [sys.executable, '-m', 'django', 'runserver', '--noreload', address]
+    if server == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', str(threads),
+                '--bind', address, 'benchmarks.wsgi:application']
+    if server == 'uvicorn':
+        return [sys.executable, '-m', 'uvicorn', '--workers', str(workers), '--port', str(port),
+                '--log-level', 'warning', 'benchmarks.asgi:application']
+    raise ValueError(server)
+
+
+def wait_for_server(server, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('Server exited with status {}'.format(server.returncode))
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except socket.error:
+            time.sleep(0.1)
+    raise RuntimeError('Server did not start on port {}'.format(port))
+
+
+def tail(path, lines=40):
+    with open(path, 'rb') as log:
+        return b''.join(log.readlines()[-lines:]).decode('utf-8', 'replace')
+
+
+def client(port, path, deadline, latencies, errors):
+    connection = HTTPConnection('127.0.0.1', port, timeout=30)
+    while time.time() < deadline:
+        start = time.time()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+        except Exception:
+            errors.append(1)
+            connection.close()
+            connection = HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        if response.status >= 400:
+            errors.append(1)
+        else:
+            latencies.append(time.time() - start)
+        if response.getheader('Connection', '').lower() == 'close':
+            connection.close()
+    connection.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def count_logs(path, since):
+    from django.db import close_old_connections
+    from rest_framework_tracking.models import APIRequestLog
+
+    close_old_connections()
+    return APIRequestLog.objects.filter(path=path, requested_at__gte=since).count()
+
+
+def measure_log_lag(path, since, expected, timeout):
+    """Seconds until `expected` logs are stored, and the number of logs missing after timeout."""
+    start = time.time()
+    while True:
+        stored = count_logs(path, since)
+        if stored >= expected or time.time() - start > timeout:
+            return time.time() - start, max(expected - stored, 0)
+        time.sleep(0.05)
+
+
+def run_path(port, path, clients, duration, lag_timeout):
+    from django.utils.timezone import now
+
+    since = now()
+    deadline = time.time() + duration
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=client, args=(port, path, deadline, latencies, errors))
+        for i in range(clients)
+    ]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    latencies.sort()
+    result = {
+        'path': path,
+        'backend': PATHS[path],
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'log_lag_ms': None,
+        'logs_missing': None,
+    }
+    if PATHS[path] != 'none':
+        lag, missing = measure_log_lag(path, since, len(latencies), lag_timeout)
+        result['log_lag_ms'] = round(lag * 1000, 1)
+        result['logs_missing'] = missing
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--server', choices=('runserver', 'gunicorn', 'uvicorn'), default='runserver')
+    parser.add_argument('--workers', type=int, default=4, help='server worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load per path')
+    parser.add_argument('--lag-timeout', type=float, default=30,
+                        help='seconds to wait for the logs to be written')
+    parser.add_argument('--path', action='append', choices=sorted(PATHS),
+                        help='paths to load, all by default')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--server-log', help='write the server output to this file, a temporary file by default')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    # a fresh SQLite database unless another one is given
+    env.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'loadtest.sqlite3'))
+    os.environ.update(env)
+
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    call_command('migrate', verbosity=0)
+
+    port = get_free_port()
+    server_log = args.server_log or os.path.join(tempfile.mkdtemp(), 'server.log')
+    with open(server_log, 'wb') as log:
+        server = subprocess.Popen(server_command(args.server, port, args.workers, args.threads), env=env, cwd=ROOT,
+                                  stdout=log, stderr=subprocess.STDOUT)
+    try:
+        try:
+            wait_for_server(server, port)
+        except RuntimeError as e:
+            sys.stderr.write('{}, server output ({}):\n{}'.format(e, server_log, tail(server_log)))
+            sys.exit(1)
+        results = []
+        for path in args.path or sorted(PATHS):
+            run_path(port, path, args.clients, min(args.duration, 1), args.lag_timeout)  # warm up
+            result = run_path(port, path, args.clients, args.duration, args.lag_timeout)
+            results.append(result)
+            print('{path:<16} {backend:<20} {throughput_rps:>9} req/s  p50 {p50_ms} ms  p99 {p99_ms} ms  '
+                  'errors {errors}  log lag {log_lag_ms} ms  missing {logs_missing}'.format(**result))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        report = {
+            'meta': {
+                'server': args.server,
+                'workers': args.workers,
+                'threads': args.threads,
+                'clients': args.clients,
+                'duration': args.duration,
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'timestamp': int(time.time()),
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
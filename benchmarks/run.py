@@ -0,0 +1,204 @@
+#! /usr/bin/env python
+"""
+Measure the per-request overhead of LoggingMixin.
+
+Each scenario times the same view with and without the mixin, called directly
+through APIRequestFactory so that URL resolution and the test client don't
+blur the numbers. Results are printed and written as JSON; pass a previous
+results file with --compare to flag regressions.
+
+    $ ./benchmarks/run.py --database file --output bench.json
+    $ ./benchmarks/run.py --compare bench.json
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def configure(database):
+    from django.conf import settings
+
+    if database == 'memory':
+        name = ':memory:'
+    else:
+        name = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    settings.configure(
+        DEBUG=False,
+        ALLOWED_HOSTS=['*'],
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name}},
+        SECRET_KEY='not very secret in benchmarks',
+        INSTALLED_APPS=(
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'rest_framework',
+            'rest_framework_tracking',
+        ),
+    )
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def build_views():
+    from rest_framework.exceptions import APIException
+    from rest_framework.response import Response
+    from rest_framework.views import APIView
+    from rest_framework_tracking.mixins import LoggingMixin, QueuedLoggingMixin, save_logs
+    from rest_framework_tracking.queues import BatchQueue
+
+    class EchoView(APIView):
+        authentication_classes = ()
+        permission_classes = ()
+
+        def get(self, request):
+            return Response('ok')
+
+        def post(self, request):
+            return Response(request.data)
+
+    class FailingView(EchoView):
+        def get(self, request):
+            raise APIException('failure')
+
+    class LoggingEchoView(LoggingMixin, EchoView):
+        pass
+
+    class LoggingFailingView(LoggingMixin, FailingView):
+        pass
+
+    class QueuedLoggingEchoView(QueuedLoggingMixin, EchoView):
+        # the queue is never drained: only the request path is measured
+        log_queue = BatchQueue(save_logs, autostart=False)
+
+    return {
+        'echo': (EchoView.as_view(), LoggingEchoView.as_view()),
+        'failing': (FailingView.as_view(), LoggingFailingView.as_view()),
+        'queued': (EchoView.as_view(), QueuedLoggingEchoView.as_view()),
+    }
+
+
+def nested(depth):
+    payload = {'value': 'leaf'}
+    for i in range(depth):
+        payload = {'level': i, 'child': payload}
+    return payload
+
+
+def build_scenarios():
+    """Yield (name, views key, request factory) for each scenario."""
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+
+    yield 'success', 'echo', lambda: factory.get('/bench')
+    yield 'error', 'failing', lambda: factory.get('/bench')
+    yield 'queued', 'queued', lambda: factory.get('/bench')
+    for size in (10, 100, 1000):
+        payload = {'key%d' % i: 'value%d' % i for i in range(size)}
+        yield 'payload_keys=%d' % size, 'echo', lambda payload=payload: factory.post('/bench', payload, format='json')
+    for depth in (1, 10, 50):
+        payload = nested(depth)
+        yield 'nesting_depth=%d' % depth, 'echo', lambda payload=payload: factory.post('/bench', payload, format='json')
+    for size in (10, 100, 1000):
+        params = {'param%d' % i: 'value%d' % i for i in range(size)}
+        yield 'query_params=%d' % size, 'echo', lambda params=params: factory.get('/bench', params)
+
+
+def time_view(view, make_request, number, repeat):
+    """Best mean time per call in microseconds, as timeit does."""
+    for i in range(min(number, 10)):
+        view(make_request()).render()
+    best = None
+    for i in range(repeat):
+        requests = [make_request() for j in range(number)]
+        start = time.perf_counter()
+        for request in requests:
+            view(request).render()
+        elapsed = (time.perf_counter() - start) / number * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(number, repeat):
+    views = build_views()
+    results = []
+    for name, key, make_request in build_scenarios():
+        baseline_view, logging_view = views[key]
+        baseline = time_view(baseline_view, make_request, number, repeat)
+        logging = time_view(logging_view, make_request, number, repeat)
+        results.append({
+            'name': name,
+            'baseline_us': round(baseline, 1),
+            'logging_us': round(logging, 1),
+            'overhead_us': round(logging - baseline, 1),
+        })
+        print('{:<22} baseline {:>9.1f}us  logging {:>9.1f}us  overhead {:>9.1f}us'.format(
+            name, baseline, logging, logging - baseline))
+    return results
+
+
+def compare(results, previous, tolerance):
+    """Print scenarios whose overhead grew by more than tolerance, return their count."""
+    previous = {result['name']: result for result in previous['results']}
+    regressions = 0
+    for result in results:
+        before = previous.get(result['name'])
+        if before is None or before['overhead_us'] <= 0:
+            continue
+        change = (result['overhead_us'] - before['overhead_us']) / before['overhead_us']
+        if change > tolerance:
+            regressions += 1
+            print('REGRESSION {}: overhead {:.1f}us -> {:.1f}us ({:+.0%})'.format(
+                result['name'], before['overhead_us'], result['overhead_us'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database', choices=('memory', 'file'), default='memory',
+                        help='SQLite in-memory or file-backed database')
+    parser.add_argument('--number', type=int, default=200, help='requests per round')
+    parser.add_argument('--repeat', type=int, default=5, help='rounds per measurement, the best is kept')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='previous JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative overhead increase reported as a regression')
+    args = parser.parse_args()
+
+    configure(args.database)
+
+    import django
+    import rest_framework
+    report = {
+        'meta': {
+            'database': args.database,
+            'number': args.number,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'djangorestframework': rest_framework.VERSION,
+            'timestamp': int(time.time()),
+        },
+        'results': run(args.number, args.repeat),
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        with open(args.compare) as previous:
+            if compare(report['results'], json.load(previous), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+"""
+Measure the encoding and decoding of logs for the backends which are not the database.
+
+Each codec of rest_framework_tracking.serialization is timed against json.dumps
+of the log dict, as a backend would do without it, on a typical log and on a
+log with a large response.
+
+    $ ./benchmarks/serialization.py --output serialization.json
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def configure():
+    from django.conf import settings
+
+    settings.configure(SECRET_KEY='not very secret in benchmarks', USE_TZ=True)
+    import django
+    django.setup()
+
+
+class User(object):
+    pk = 42
+
+
+def build_logs():
+    """Yield (name, log dict) for each scenario."""
+    from django.utils.timezone import now
+
+    log = {
+        'requested_at': now(),
+        'user': User(),
+        'response_ms': 12,
+        'path': '/api/orders/1234',
+        'route': 'api/orders/<int:pk>',
+        'view': 'shop.views.OrderViewSet',
+        'view_method': 'retrieve',
+        'remote_addr': '203.0.113.7',
+        'host': 'api.example.com',
+        'method': 'GET',
+        'query_params': {'expand': 'items'},
+        'headers': {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0'},
+        'data': {},
+        'response': '{"id":1234,"status":"shipped"}',
+        'status_code': 200,
+        'request_size': 0,
+        'response_size': 30,
+        'content_type': 'application/json',
+        'trace_id': '4bf92f3577b34da6a3ce929d0e0e4736',
+        'span_id': '00f067aa0ba902b7',
+    }
+    yield 'typical', log
+    large = dict(log, response=json.dumps([{'id': i, 'status': 'shipped'} for i in range(1000)]))
+    yield 'large_response', large
+
+
+def best_time(func, number, repeat):
+    """Best mean time per call in microseconds, as timeit does."""
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def build_codecs():
+    """Yield (name, encode, decode) for json.dumps and each available codec."""
+    from rest_framework_tracking import serialization
+
+    yield ('json.dumps',
+           lambda log: json.dumps(log, default=str).encode('utf-8'),
+           lambda data: json.loads(data.decode('utf-8')))
+    yield 'json', serialization.dumps, serialization.loads
+    if serialization.orjson is not None:
+        yield 'json (orjson)', serialization.dumps, serialization.loads
+    if serialization.msgpack is not None:
+        yield ('msgpack',
+               lambda log: serialization.dumps(log, 'msgpack'),
+               serialization.loads)
+
+
+def run(number, repeat):
+    from rest_framework_tracking import serialization
+
+    results = []
+    for log_name, log in build_logs():
+        for codec_name, encode, decode in build_codecs():
+            orjson = serialization.orjson
+            if codec_name == 'json':
+                # the standard library json module, whether orjson is installed or not
+                serialization.orjson = None
+            try:
+                data = encode(log)
+                encode_us = best_time(lambda: encode(log), number, repeat)
+                decode_us = best_time(lambda: decode(data), number, repeat)
+            finally:
+                serialization.orjson = orjson
+            results.append({
+                'name': '{} {}'.format(log_name, codec_name),
+                'encode_us': round(encode_us, 2),
+                'decode_us': round(decode_us, 2),
+                'bytes': len(data),
+            })
+            print('{:<30} encode {:>8.2f}us  decode {:>8.2f}us  {:>7} bytes'.format(
+                results[-1]['name'], encode_us, decode_us, len(data)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=10000, help='calls per round')
+    parser.add_argument('--repeat', type=int, default=5, help='rounds per measurement, the best is kept')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    configure()
+
+    report = {
+        'meta': {
+            'number': args.number,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'timestamp': int(time.time()),
+        },
+        'results': run(args.number, args.repeat),
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Settings serving the test project (tests/urls.py) for the load test harness.
+
+The database is taken from DATABASE_URL, so every worker and the harness share it.
+"""
+import environ
+
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+SECRET_KEY = 'not very secret in load tests'
+ROOT_URLCONF = 'tests.urls'
+USE_TZ = True
+
+DATABASES = {
+    'default': environ.Env().db(default='sqlite:///drf-tracking-loadtest.sqlite3'),
+}
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # wait for the lock rather than failing when workers write concurrently
+    DATABASES['default']['OPTIONS'] = {'timeout': 30}
+
+MIDDLEWARE = (
+    'django.middleware.common.CommonMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+# tests/urls.py serves the admin
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'context_processors': [
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}]
+
+INSTALLED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.messages',
+    'django.contrib.sessions',
+    'rest_framework',
+    'rest_framework.authtoken',
+    'tests',
+    'rest_framework_tracking',
+)
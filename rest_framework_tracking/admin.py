@@ -1,16 +1,100 @@
+from django.conf import settings
+from django.conf.urls import url
 from django.contrib import admin
-from .models import APIRequestLog
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.html import format_html
+
+from .models import APIErrorGroup, APIRequestLog, APIRequestProfile
+from .routers import can_join_users
+
+USER_SNAPSHOT = getattr(settings, 'DRF_TRACKING_USER_SNAPSHOT', False)
 
 
 class APIRequestLogAdmin(admin.ModelAdmin):
     date_hierarchy = 'requested_at'
     list_display = ('id', 'requested_at', 'response_ms', 'status_code',
-                    'user', 'method',
+                    'username' if USER_SNAPSHOT else 'user', 'method',
                     'path', 'remote_addr', 'host',
                     'query_params')
     list_filter = ('method', 'status_code')
-    search_fields = ('path', 'user__email',)
-    raw_id_fields = ('user', )
+    # searching the snapshot doesn't join the user table
+    search_fields = ('path', 'username', 'user_email') if USER_SNAPSHOT else ('path', 'user__email',)
+    raw_id_fields = ('user', 'view_dimension', 'view_method_dimension', 'host_dimension', 'method_dimension')
+    readonly_fields = ('profile_link', 'request_headers')
+
+    def get_queryset(self, request):
+        queryset = super(APIRequestLogAdmin, self).get_queryset(request)
+        if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+            return queryset.with_dimensions()
+        return queryset
+
+    def get_list_display(self, request):
+        if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+            # the method and host columns are empty
+            return tuple({'method': 'method_name', 'host': 'host_name'}.get(name, name) for name in self.list_display)
+        return self.list_display
+
+    def get_list_filter(self, request):
+        if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+            return (('method_dimension', admin.RelatedOnlyFieldListFilter), 'status_code')
+        return self.list_filter
+
+    def method_name(self, obj):
+        return obj.method_name
+    method_name.short_description = 'Method'
+    method_name.admin_order_field = 'method_name'
+
+    def host_name(self, obj):
+        return obj.host_name
+    host_name.short_description = 'Host'
+    host_name.admin_order_field = 'host_name'
+
+    def get_search_fields(self, request):
+        if not USER_SNAPSHOT and not can_join_users(APIRequestLog):
+            # the users are in another database
+            return ('path',)
+        return self.search_fields
+
+    def get_urls(self):
+        return [
+            url(r'^(.+)/profile/$', self.admin_site.admin_view(self.profile_view),
+                name='rest_framework_tracking_apirequestlog_profile'),
+        ] + super(APIRequestLogAdmin, self).get_urls()
+
+    def profile_view(self, request, object_id):
+        """Download the profile of a request as folded stacks."""
+        has_permission = getattr(self, 'has_view_or_change_permission', self.has_change_permission)
+        if not has_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(APIRequestProfile, log_id=object_id)
+        response = HttpResponse(profile.get_folded_stacks(), content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="request-{}.folded"'.format(object_id)
+        return response
+
+    def profile_link(self, obj):
+        if obj.pk is None or not APIRequestProfile.objects.filter(log_id=obj.pk).exists():
+            return '-'
+        return format_html('<a href="{}">Download folded stacks</a>',
+                           reverse('admin:rest_framework_tracking_apirequestlog_profile', args=(obj.pk,)))
+    profile_link.short_description = 'Profile'
+
+    def request_headers(self, obj):
+        return '\n'.join('{}: {}'.format(name, value) for name, value in sorted(obj.get_headers().items()))
+    request_headers.short_description = 'Request headers'
 
 
 admin.site.register(APIRequestLog, APIRequestLogAdmin)
+
+
+class APIErrorGroupAdmin(admin.ModelAdmin):
+    date_hierarchy = 'last_seen'
+    list_display = ('id', '__str__', 'count', 'first_seen', 'last_seen', 'fingerprint')
+    ordering = ('-last_seen',)
+    search_fields = ('fingerprint',)
+    raw_id_fields = ('sample_log', )
+
+
+admin.site.register(APIErrorGroup, APIErrorGroupAdmin)
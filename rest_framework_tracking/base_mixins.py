@@ -1,13 +1,41 @@
 import ast
 import logging
+import random
+import sys
 import traceback
 
-from django.db import connection
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
 from django.utils.timezone import now
+from rest_framework.request import Request
+
+from . import errors, headers, memory, metrics, networks, profiling, throttling, tracing
+from .routers import get_write_database
 
 
 logger = logging.getLogger(__name__)
 
+# what is captured besides the request metadata, by increasing cost
+CAPTURE_METADATA = 'metadata'
+CAPTURE_HEADERS = 'headers'  # and request headers and query parameters
+CAPTURE_FULL = 'full'  # and request data, response and errors
+
+
+class _Closable(object):
+    def __init__(self, callback):
+        self.close = callback
+
+
+def _call_on_close(response, callback):
+    """Run callback when the response is closed by the server."""
+    closers = getattr(response, '_resource_closers', None)
+    if closers is not None:
+        # Django >= 3.0
+        closers.append(callback)
+    else:
+        response._closable_objects.append(_Closable(callback))
+
 
 class BaseLoggingMixin(object):
     """Mixin to log requests"""
@@ -16,15 +44,48 @@ class BaseLoggingMixin(object):
 
     logging_methods = '__all__'
     sensitive_fields = {}
+    record_metrics = getattr(settings, 'DRF_TRACKING_METRICS', False)
+    export_spans = bool(getattr(settings, 'DRF_TRACKING_OTLP_ENDPOINT', None))
+    exception_capture = getattr(settings, 'DRF_TRACKING_EXCEPTION_CAPTURE', errors.CAPTURE_FULL)
+    traceback_depth = getattr(settings, 'DRF_TRACKING_TRACEBACK_DEPTH', 20)
+    profile_sample_rate = getattr(settings, 'DRF_TRACKING_PROFILE_SAMPLE_RATE', 0)
+    profile_threshold_ms = getattr(settings, 'DRF_TRACKING_PROFILE_THRESHOLD_MS', 1000)
+    profile = None
+    _profiler = None
+    memory_sample_rate = getattr(settings, 'DRF_TRACKING_MEMORY_SAMPLE_RATE', 0)
+    memory_top_threshold = getattr(settings, 'DRF_TRACKING_MEMORY_TOP_THRESHOLD', None)
+    _allocation_tracker = None
+    capture_level = getattr(settings, 'DRF_TRACKING_CAPTURE_LEVEL', CAPTURE_FULL)
+    capture_escalate_ms = getattr(settings, 'DRF_TRACKING_CAPTURE_ESCALATE_MS', None)
+    logged_headers = getattr(settings, 'DRF_TRACKING_HEADERS', ())
+    trusted_proxies = getattr(settings, 'DRF_TRACKING_TRUSTED_PROXIES', None)
+    count_rate = getattr(settings, 'DRF_TRACKING_RATE_COUNTER', False)
+    snapshot_user = getattr(settings, 'DRF_TRACKING_USER_SNAPSHOT', False)
+    _raw_data = None
+    _capture_response = False
+    _exception = None
 
     def __init__(self, *args, **kwargs):
         assert isinstance(self.CLEANED_SUBSTITUTE, str), 'CLEANED_SUBSTITUTE must be a string.'
+        assert not self.record_metrics or metrics.is_available(), 'record_metrics requires prometheus_client.'
+        assert not self.memory_sample_rate or memory.tracemalloc, 'memory_sample_rate requires Python 3.'
+        assert self.trusted_proxies is None or networks.ipaddress, 'trusted_proxies requires the ipaddress module.'
         super(BaseLoggingMixin, self).__init__(*args, **kwargs)
 
     def initial(self, request, *args, **kwargs):
         self.log = {}
         self.log['requested_at'] = now()
-        self.log['data'] = self._clean_data(request.body)
+        if self.profile_sample_rate and random.random() * self.profile_sample_rate < 1:
+            # profile one in profile_sample_rate requests
+            self._profiler = profiling.Sampler()
+            self._profiler.start()
+        if self.memory_sample_rate and random.random() * self.memory_sample_rate < 1:
+            # track the memory of one in memory_sample_rate requests
+            self._allocation_tracker = memory.AllocationTracker(self.memory_top_threshold)
+            self._allocation_tracker.start()
+        self._start_trace(request)
+        # cleaned once the capture level is known
+        self._raw_data = request.body
 
         super(BaseLoggingMixin, self).initial(request, *args, **kwargs)
 
@@ -36,62 +97,120 @@ class BaseLoggingMixin(object):
             data = self.request.data.dict()
         except AttributeError:
             data = self.request.data
-        self.log['data'] = self._clean_data(data)
+        self._raw_data = data
 
     def handle_exception(self, exc):
-        response = super(BaseLoggingMixin, self).handle_exception(exc)
-        self.log['errors'] = traceback.format_exc()
+        try:
+            response = super(BaseLoggingMixin, self).handle_exception(exc)
+        except Exception:
+            # unhandled exceptions skip finalize_response
+            self._stop_profiler()
+            self._stop_allocation_tracker()
+            raise
+        # formatted once the capture level is known
+        self._exception = (exc, sys.exc_info()[2])
 
         return response
 
     def finalize_response(self, request, response, *args, **kwargs):
         response = super(BaseLoggingMixin, self).finalize_response(request, response, *args, **kwargs)
+        self._stop_profiler()
+        self._stop_allocation_tracker()
+
+        if self.record_metrics:
+            # every request is counted, whether it is logged or not
+            metrics.observe(self._get_view_name(request), self._get_view_method(request),
+                            response.status_code, self._get_response_ms())
+        if self.count_rate and not getattr(request, '_tracking_counted', False):
+            # unless a TrackingRateThrottle counted it already
+            key = throttling.get_counter_key(request, self._get_ip_address(request))
+            throttling.get_request_counter().incr(key)
 
         # Ensure backward compatibility for those using _should_log hook
         should_log = self._should_log if hasattr(self, '_should_log') else self.should_log
 
         if should_log(request, response):
-            if response.streaming:
-                rendered_content = None
-            elif hasattr(response, 'rendered_content'):
-                rendered_content = response.rendered_content
-            else:
-                rendered_content = response.getvalue()
-
+            response_ms = self._get_response_ms()
+            capture_level = self.get_capture_level(response_ms, response.status_code)
             self.log.update(
                 {
                     'remote_addr': self._get_ip_address(request),
                     'view': self._get_view_name(request),
                     'view_method': self._get_view_method(request),
                     'path': request.path,
+                    'route': self._get_route(request),
                     'host': request.get_host(),
                     'method': request.method,
-                    'query_params': self._clean_data(request.query_params.dict()),
-                    'user': self._get_user(request),
-                    'response_ms': self._get_response_ms(),
-                    'response': self._clean_data(rendered_content),
+                    'user_id': self._get_user_id(request),
+                    'response_ms': response_ms,
                     'status_code': response.status_code,
                 }
             )
-            if self._clean_data(request.query_params.dict()) == {}:
-                self.log.update({'query_params': self.log['data']})
-            try:
-                if not connection.settings_dict.get('ATOMIC_REQUESTS'):
-                    self.handle_log()
-                else:
-                    if getattr(response, 'exception', None) and connection.in_atomic_block:
-                        # response with exception (HTTP status like: 401, 404, etc)
-                        # pointwise disable atomic block for handle log (TransactionManagementError)
-                        connection.set_rollback(True)
-                        connection.set_rollback(False)
-                    self.handle_log()
-            except Exception:
-                # ensure that all exceptions raised by handle_log
-                # doesn't prevent API call to continue as expected
-                logger.exception('Logging API call raise exception!')
+            if self.snapshot_user:
+                self.log['username'], self.log['user_email'] = self._get_user_snapshot(request)
+            if capture_level != CAPTURE_METADATA:
+                self.log['headers'] = self._get_headers(request)
+                self.log['query_params'] = self._clean_data(request.query_params.dict())
+            self._capture_response = capture_level == CAPTURE_FULL
+            if self._capture_response:
+                self._capture_full()
+            if self.export_spans:
+                tracing.span_queue.put(tracing.build_span(self.log, self.parent_span_id))
+            if getattr(response, 'is_rendered', True):
+                self._log_response(response)
+            else:
+                # Django renders the response after the view: log it then, without rendering
+                # it twice. A response which is never rendered, e.g. returned by a view called
+                # directly, is not logged.
+                response.add_post_render_callback(self._log_response)
 
         return response
 
+    def get_capture_level(self, response_ms, status_code):
+        """
+        Return what to capture of the request: `capture_level`, escalated to
+        full capture for server errors and requests slower than `capture_escalate_ms`.
+        """
+        if status_code >= 500:
+            return CAPTURE_FULL
+        if self.capture_escalate_ms is not None and response_ms >= self.capture_escalate_ms:
+            return CAPTURE_FULL
+        return self.capture_level
+
+    def _capture_full(self):
+        """Clean and log the request data and errors."""
+        self.log['data'] = self._clean_data(self._raw_data)
+        if self.log['query_params'] == {}:
+            self.log['query_params'] = self.log['data']
+        self._capture_exception()
+
+    def _capture_exception(self):
+        """Log the exception the view raised, if any."""
+        if self._exception is not None:
+            exc, tb = self._exception
+            if self.exception_capture == errors.CAPTURE_BOUNDED:
+                self.log['errors'], self.log['error_fingerprint'], error_traceback = errors.capture(
+                    exc, tb, self.traceback_depth)
+                if error_traceback is not None:
+                    # for the process saving the log, which may not be this one
+                    self.log['error_traceback'] = error_traceback
+            else:
+                self.log['errors'] = ''.join(traceback.format_exception(type(exc), exc, tb))
+
+    def _log_response(self, response):
+        """Log the rendered response, then persist the log."""
+        try:
+            self.log['request_size'] = self._get_request_size(self.request)
+            self.log['response_size'] = self._get_response_size(response)
+            self.log['content_type'] = self._get_content_type(response)
+            if self._capture_response:
+                self.log['response'] = None if response.streaming else self._clean_data(response.content)
+            self._persist_log(response)
+        except Exception:
+            # ensure that all exceptions raised by handle_log
+            # doesn't prevent API call to continue as expected
+            logger.exception('Logging API call raise exception!')
+
     def handle_log(self):
         """
         Hook to define what happens with the log.
@@ -100,14 +219,100 @@ class BaseLoggingMixin(object):
         """
         raise NotImplementedError
 
+    def _persist_log(self, response):
+        """
+        Call handle_log without touching the request's transaction.
+
+        When the log database is inside an atomic block already marked for rollback
+        (DRF does so for handled exceptions with ATOMIC_REQUESTS), the log is written
+        once the response is closed, i.e. after the request's transaction is over.
+        """
+        connection = connections[get_write_database()]
+        if connection.in_atomic_block and connection.needs_rollback:
+            _call_on_close(response, self._handle_log_on_close)
+        else:
+            self.handle_log()
+
+    def _handle_log_on_close(self):
+        try:
+            self.handle_log()
+        except Exception:
+            logger.exception('Logging API call raise exception!')
+
+    def _stop_profiler(self):
+        """Stop the profiler, keep its profile if the request was slow."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        profiler.stop()
+        if profiler.samples and self._get_response_ms() >= self.profile_threshold_ms:
+            self.profile = profiler
+
+    def _stop_allocation_tracker(self):
+        tracker, self._allocation_tracker = self._allocation_tracker, None
+        if tracker is None:
+            return
+        tracker.stop()
+        self.log['memory_peak'] = tracker.peak
+        self.log['memory_net'] = tracker.net
+        self.log['memory_top'] = tracker.top
+
+    def _start_trace(self, request):
+        """Continue the trace of the `traceparent` header, or start a new one."""
+        trace_id, self.parent_span_id = tracing.parse_traceparent(request.META.get('HTTP_TRACEPARENT'))
+        self.log['trace_id'] = trace_id or tracing.new_trace_id()
+        self.log['span_id'] = tracing.new_span_id()
+
     def _get_ip_address(self, request):
         """Get the remote ip address the request was generated from. """
         ipaddr = request.META.get("HTTP_X_FORWARDED_FOR", None)
+        if self.trusted_proxies is not None:
+            return networks.get_client_address(request.META.get("REMOTE_ADDR", ""), ipaddr,
+                                               networks.get_network_set(self.trusted_proxies))
         if ipaddr:
             # X_FORWARDED_FOR returns client1, proxy1, proxy2,...
             return ipaddr.split(",")[0].strip()
         return request.META.get("REMOTE_ADDR", "")
 
+    def _get_headers(self, request):
+        """Get the request headers listed in logged_headers, sensitive values cleaned."""
+        sensitive_headers = headers.SENSITIVE_HEADERS | {
+            field.lower().replace('-', '_') for field in self.sensitive_fields
+        }
+        captured = {}
+        for name in self.logged_headers:
+            value = request.META.get(headers.get_meta_key(name))
+            if value is not None:
+                if name.lower().replace('-', '_') in sensitive_headers:
+                    value = self.CLEANED_SUBSTITUTE
+                captured[name] = value
+        return captured
+
+    def _get_request_size(self, request):
+        """Get the size of the request body in bytes, from its Content-Length."""
+        try:
+            return int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return None
+
+    def _get_response_size(self, response):
+        """Get the size of the response body in bytes, None if it is streamed without Content-Length."""
+        if response.has_header('Content-Length'):
+            return int(response['Content-Length'])
+        if response.streaming:
+            return None
+        return len(response.content)
+
+    def _get_content_type(self, response):
+        """Get the media type of the response, without parameters."""
+        content_type = response.get('Content-Type')
+        return content_type.split(';', 1)[0].strip() if content_type else None
+
+    def _get_route(self, request):
+        """Get the URL pattern the request matched, e.g. `api/users/<int:pk>/`, on Django >= 2.2."""
+        route = getattr(request.resolver_match, 'route', None)
+        return route[:255] if route else None
+
     def _get_view_name(self, request):
         """Get view name."""
         method = request.method.lower()
@@ -131,6 +336,33 @@ class BaseLoggingMixin(object):
             return None
         return user
 
+    def _get_user_id(self, request):
+        """Get the user id, without authenticating the request when DRF authentication didn't run."""
+        if isinstance(request, Request):
+            if '_user' not in request.__dict__:
+                # the view authenticates lazily and didn't: use Django's authentication
+                return self._get_user_id(request._request)
+            user = request._user
+            if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+                # a lazy user of the authenticator, whose token may hold the id
+                user_id = getattr(request.__dict__.get('_auth'), 'user_id', None)
+                if user_id is not None:
+                    return user_id
+        else:
+            # the lazy user of AuthenticationMiddleware, loaded by django.contrib.auth.get_user()
+            user = getattr(request, 'user', None)
+        if user is None or user.is_anonymous:
+            return None
+        return user.pk
+
+    def _get_user_snapshot(self, request):
+        """Get the (username, email) of the user, stored with the log with `snapshot_user`."""
+        user = getattr(request, 'user', None)
+        if user is None or user.is_anonymous:
+            return None, None
+        email_field = getattr(user, 'get_email_field_name', lambda: 'email')()
+        return user.get_username()[:150], getattr(user, email_field, None) or None
+
     def _get_response_ms(self):
         """
         Get the duration of the request response cycle is milliseconds.
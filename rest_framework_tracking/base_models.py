@@ -2,7 +2,21 @@ from django.db import models
 from django.conf import settings
 from six import python_2_unicode_compatible
 
-from .managers import PrefetchUserManager
+from .managers import APIRequestLogQuerySet, PrefetchUserManager
+
+
+def dimension_field():
+    return models.ForeignKey(
+        'rest_framework_tracking.APIDimension',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+',
+        # indexed by migration with DRF_TRACKING_DIMENSION_TABLES, and without a
+        # constraint, which MySQL would back with an index
+        db_index=False,
+        db_constraint=False,
+    )
 
 
 @python_2_unicode_compatible
@@ -10,16 +24,29 @@ class BaseAPIRequestLog(models.Model):
     """ Logs Django rest framework API requests """
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
-        on_delete=models.SET_NULL,
+        # the users may live in another database than the logs: no constraint, and
+        # models.unset_deleted_user rather than SET_NULL, which queries the users' database
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         null=True,
         blank=True,
     )
+    # with DRF_TRACKING_USER_SNAPSHOT, the user's at the time of the request
+    username = models.CharField(max_length=150, null=True, blank=True)
+    user_email = models.EmailField(max_length=254, null=True, blank=True)
     requested_at = models.DateTimeField(db_index=True)
     response_ms = models.PositiveIntegerField(default=0)
     path = models.CharField(
         max_length=getattr(settings, 'DRF_TRACKING_PATH_LENGTH', 200),
         db_index=True,
     )
+    route = models.ForeignKey(
+        'rest_framework_tracking.APIRoute',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
     view = models.CharField(
         max_length=getattr(settings, 'DRF_TRACKING_VIEW_LENGTH', 200),
         null=True,
@@ -33,14 +60,31 @@ class BaseAPIRequestLog(models.Model):
         db_index=True,
     )
     remote_addr = models.GenericIPAddressField()
+    # with DRF_TRACKING_PACKED_IP, remote_addr as 16 bytes in hex, IPv4 addresses mapped to IPv6, indexed by migration
+    remote_addr_packed = models.CharField(max_length=32, null=True, blank=True)
     host = models.URLField()
     method = models.CharField(max_length=10)
+    # with DRF_TRACKING_DIMENSION_TABLES, replace view, view_method, host and method
+    view_dimension = dimension_field()
+    view_method_dimension = dimension_field()
+    host_dimension = dimension_field()
+    method_dimension = dimension_field()
     query_params = models.TextField(null=True, blank=True)
+    headers = models.TextField(null=True, blank=True)
     data = models.TextField(null=True, blank=True)
     response = models.TextField(null=True, blank=True)
     errors = models.TextField(null=True, blank=True)
+    error_fingerprint = models.CharField(max_length=40, null=True, blank=True, db_index=True)
     status_code = models.PositiveIntegerField(null=True, blank=True)
-    objects = PrefetchUserManager()
+    request_size = models.PositiveIntegerField(null=True, blank=True)
+    response_size = models.PositiveIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, null=True, blank=True)
+    trace_id = models.CharField(max_length=32, null=True, blank=True, db_index=True)
+    span_id = models.CharField(max_length=16, null=True, blank=True)
+    memory_peak = models.BigIntegerField(null=True, blank=True)
+    memory_net = models.BigIntegerField(null=True, blank=True)
+    memory_top = models.TextField(null=True, blank=True)
+    objects = PrefetchUserManager.from_queryset(APIRequestLogQuerySet)()
 
     class Meta:
         abstract = True
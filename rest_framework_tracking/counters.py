@@ -0,0 +1,95 @@
+import atexit
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from .models import APIActivityCounter
+from .routers import get_read_database, get_write_database
+
+
+logger = logging.getLogger(__name__)
+
+USER = 'user'
+IP = 'ip'
+
+# counts not stored yet: (kind, key, bucket) -> [requests, errors]
+_pending = {}
+_pending_lock = threading.Lock()
+_last_flush = time.time()
+
+
+def get_bucket(requested_at, bucket_size):
+    """Start of the `bucket_size` seconds bucket of requested_at, bucket_size dividing a day."""
+    seconds = requested_at.hour * 3600 + requested_at.minute * 60 + requested_at.second
+    return requested_at.replace(microsecond=0) - datetime.timedelta(seconds=seconds % bucket_size)
+
+
+def count_requests(logs, using):
+    """
+    Count the requests and errors (status >= 400) of logs per user and per IP address.
+
+    Counts are coalesced in process and added with one UPDATE or INSERT per counter every
+    `DRF_TRACKING_COUNTER_FLUSH_INTERVAL` seconds (0, the default, on every call).
+    """
+    bucket_size = getattr(settings, 'DRF_TRACKING_COUNTER_BUCKET_SIZE', 60)
+    with _pending_lock:
+        for log in logs:
+            bucket = get_bucket(log.requested_at, bucket_size)
+            error = 1 if log.status_code is not None and log.status_code >= 400 else 0
+            keys = [(IP, log.remote_addr, bucket)]
+            if log.user_id is not None:
+                keys.append((USER, str(log.user_id), bucket))
+            for key in keys:
+                counts = _pending.setdefault(key, [0, 0])
+                counts[0] += 1
+                counts[1] += error
+
+    if _pending and time.time() - _last_flush >= getattr(settings, 'DRF_TRACKING_COUNTER_FLUSH_INTERVAL', 0):
+        flush_counters(using)
+
+
+def flush_counters(using):
+    """Add the coalesced counts to their counters, creating the missing ones."""
+    global _last_flush
+    _last_flush = time.time()
+    with _pending_lock:
+        pending = list(_pending.items())
+        _pending.clear()
+    for (kind, key, bucket), (requests, errors) in pending:
+        _add(using, kind, key, bucket, requests, errors)
+
+
+def _add(using, kind, key, bucket, requests, errors):
+    counters = APIActivityCounter.objects.using(using).filter(kind=kind, key=key, bucket=bucket)
+    if counters.update(requests=F('requests') + requests, errors=F('errors') + errors):
+        return
+    try:
+        with transaction.atomic(using=using):
+            APIActivityCounter.objects.using(using).create(
+                kind=kind, key=key, bucket=bucket, requests=requests, errors=errors)
+    except IntegrityError:
+        # created concurrently by another process
+        counters.update(requests=F('requests') + requests, errors=F('errors') + errors)
+
+
+def get_counts(kind, key, since):
+    """Return the (requests, errors) of a user id or IP address, in the buckets since a date-time."""
+    bucket = get_bucket(since, getattr(settings, 'DRF_TRACKING_COUNTER_BUCKET_SIZE', 60))
+    totals = APIActivityCounter.objects.using(get_read_database()).filter(
+        kind=kind, key=str(key), bucket__gte=bucket,
+    ).aggregate(requests=Sum('requests'), errors=Sum('errors'))
+    return totals['requests'] or 0, totals['errors'] or 0
+
+
+@atexit.register
+def _flush_counters_at_exit():
+    if _pending:
+        try:
+            flush_counters(get_write_database())
+        except Exception:
+            logger.exception('Counting API requests raise exception!')
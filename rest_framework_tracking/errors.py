@@ -0,0 +1,173 @@
+import atexit
+import hashlib
+import logging
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import DateTimeField, F, Value
+from django.db.models.functions import Greatest
+from django.http import Http404
+from rest_framework.exceptions import APIException
+
+from .models import APIErrorGroup
+from .routers import get_write_database
+
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FULL = 'full'
+CAPTURE_BOUNDED = 'bounded'
+
+# fingerprints known to be stored with their traceback, and the traceback of every
+# fingerprint seen, to store or store again if the group was deleted
+_stored_fingerprints = set()
+_tracebacks = {}
+# occurrences of stored fingerprints not counted yet: fingerprint -> [count, first seen, last seen]
+_occurrences = {}
+_occurrences_lock = threading.Lock()
+_last_flush = time.time()
+
+
+def is_expected(exc):
+    """Client errors DRF raises routinely (401, 403, 404, validation errors...)."""
+    if isinstance(exc, APIException):
+        return exc.status_code < 500
+    return isinstance(exc, (Http404, PermissionDenied))
+
+
+def summarize(exc):
+    return '{}: {}'.format(type(exc).__name__, exc)
+
+
+def get_fingerprint(exc, tb):
+    """
+    Hash the exception type and the code locations of its frames.
+
+    Line numbers are left out so a group survives unrelated edits of the same files.
+    """
+    fingerprint = hashlib.sha1('{}.{}'.format(type(exc).__module__, type(exc).__name__).encode('utf-8'))
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        fingerprint.update('\n{}:{}'.format(code.co_filename, code.co_name).encode('utf-8'))
+        tb = tb.tb_next
+    return fingerprint.hexdigest()
+
+
+def format_bounded(exc, tb, depth):
+    """Format the traceback, keeping only the `depth` innermost frames."""
+    frames = []
+    while tb is not None:
+        frames.append(tb)
+        tb = tb.tb_next
+    if depth and len(frames) > depth:
+        frames = frames[-depth:]
+    return ''.join(traceback.format_exception(type(exc), exc, frames[0] if frames else None))
+
+
+def capture(exc, tb, depth):
+    """
+    Return the (errors, fingerprint, traceback) to log for exc.
+
+    Expected errors are summarized without formatting a traceback. Other tracebacks
+    are formatted once per fingerprint, and kept aside for `save_error_groups`.
+    traceback is only returned the first time the process sees its fingerprint,
+    for the log to carry it to the process saving it, see `add_traceback`.
+    """
+    if is_expected(exc):
+        return summarize(exc), None, None
+    fingerprint = get_fingerprint(exc, tb)
+    if fingerprint in _tracebacks:
+        return summarize(exc), fingerprint, None
+    _tracebacks[fingerprint] = format_bounded(exc, tb, depth)
+    return summarize(exc), fingerprint, _tracebacks[fingerprint]
+
+
+def add_traceback(fingerprint, traceback):
+    """Keep the traceback of a fingerprint captured by another process, e.g. a worker of the ring buffer."""
+    _tracebacks.setdefault(fingerprint, traceback)
+
+
+def _create_group(fingerprint, using, count, first_seen, last_seen, sample_log=None):
+    """
+    Create the group of fingerprint unless it exists, return whether it was created.
+
+    A group is created without a traceback when the log carrying it was lost,
+    e.g. dropped by a full ring buffer: the fingerprint is only known to be
+    stored once a later log brings the traceback to fill in.
+    """
+    traceback = _tracebacks.get(fingerprint, '')
+    group, created = APIErrorGroup.objects.using(using).get_or_create(
+        fingerprint=fingerprint,
+        defaults={
+            'traceback': traceback,
+            'first_seen': first_seen,
+            'last_seen': last_seen,
+            'count': count,
+            'sample_log': sample_log,
+        },
+    )
+    if traceback and not group.traceback:
+        APIErrorGroup.objects.using(using).filter(pk=group.pk, traceback='').update(traceback=traceback)
+    if traceback or group.traceback:
+        _stored_fingerprints.add(fingerprint)
+    return created
+
+
+def save_error_groups(logs, using):
+    """
+    Create the groups of new fingerprints and count the occurrences of known ones.
+
+    Occurrences are coalesced in process and added with one UPDATE per group every
+    `DRF_TRACKING_ERROR_GROUP_FLUSH_INTERVAL` seconds (0, the default, on every call).
+    """
+    for log in logs:
+        fingerprint = log.error_fingerprint
+        if not fingerprint:
+            continue
+        if fingerprint not in _stored_fingerprints:
+            if _create_group(fingerprint, using, 1, log.requested_at, log.requested_at, log if log.pk else None):
+                continue
+        with _occurrences_lock:
+            occurrence = _occurrences.setdefault(fingerprint, [0, log.requested_at, log.requested_at])
+            occurrence[0] += 1
+            occurrence[1] = min(occurrence[1], log.requested_at)
+            occurrence[2] = max(occurrence[2], log.requested_at)
+
+    if _occurrences and time.time() - _last_flush >= getattr(settings, 'DRF_TRACKING_ERROR_GROUP_FLUSH_INTERVAL', 0):
+        flush_error_groups(using)
+
+
+def flush_error_groups(using):
+    """Add the coalesced occurrences to their groups, creating the groups deleted meanwhile."""
+    global _last_flush
+    _last_flush = time.time()
+    with _occurrences_lock:
+        occurrences = list(_occurrences.items())
+        _occurrences.clear()
+    for fingerprint, (count, first_seen, last_seen) in occurrences:
+        if not _add_occurrences(fingerprint, using, count, last_seen):
+            # the group was deleted
+            _stored_fingerprints.discard(fingerprint)
+            if not _create_group(fingerprint, using, count, first_seen, last_seen):
+                # created again by another process meanwhile
+                _add_occurrences(fingerprint, using, count, last_seen)
+
+
+def _add_occurrences(fingerprint, using, count, last_seen):
+    """Add occurrences to the group of fingerprint, return whether it exists."""
+    return APIErrorGroup.objects.using(using).filter(fingerprint=fingerprint).update(
+        count=F('count') + count,
+        last_seen=Greatest('last_seen', Value(last_seen, output_field=DateTimeField())),
+    )
+
+
+@atexit.register
+def _flush_error_groups_at_exit():
+    if _occurrences:
+        try:
+            flush_error_groups(get_write_database())
+        except Exception:
+            logger.exception('Counting API errors raise exception!')
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+class LogFilters(object):
+    """Filters of the query API and the live tail, on view, status codes, user and time range."""
+
+    def __init__(self, view=None, status_codes=None, user=None, since=None, until=None):
+        self.view = view
+        self.status_codes = set(status_codes) if status_codes else None
+        self.user = user
+        self.since = since
+        self.until = until
+
+    @classmethod
+    def from_params(cls, params):
+        """Parse `view`, `status_code` (comma separated), `user`, `since` and `until` (ISO 8601)."""
+        filters = cls(view=params.get('view') or None)
+        if params.get('status_code'):
+            try:
+                filters.status_codes = {int(code) for code in params['status_code'].split(',')}
+            except ValueError:
+                raise ValidationError({'status_code': 'Expected comma separated status codes.'})
+        if params.get('user'):
+            try:
+                filters.user = get_user_model()._meta.pk.to_python(params['user'])
+            except DjangoValidationError:
+                raise ValidationError({'user': 'Expected a user id.'})
+        for name in ('since', 'until'):
+            if params.get(name):
+                try:
+                    value = parse_datetime(params[name])
+                except ValueError:
+                    value = None
+                if value is None:
+                    raise ValidationError({name: 'Expected an ISO 8601 date-time.'})
+                setattr(filters, name, value)
+        return filters
+
+    def filter(self, queryset):
+        if self.view is not None:
+            if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+                queryset = queryset.filter(view_dimension__value=self.view)
+            else:
+                queryset = queryset.filter(view=self.view)
+        if self.status_codes is not None:
+            queryset = queryset.filter(status_code__in=self.status_codes)
+        if self.user is not None:
+            queryset = queryset.filter(user_id=self.user)
+        if self.since is not None:
+            queryset = queryset.filter(requested_at__gte=self.since)
+        if self.until is not None:
+            queryset = queryset.filter(requested_at__lt=self.until)
+        return queryset
+
+    def matches(self, log):
+        """Whether a log serialized by APIRequestLogSerializer passes the view, status code and user filters."""
+        if self.view is not None and log['view'] != self.view:
+            return False
+        if self.status_codes is not None and log['status_code'] not in self.status_codes:
+            return False
+        return self.user is None or log['user'] == self.user
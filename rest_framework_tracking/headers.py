@@ -0,0 +1,39 @@
+import json
+
+from django.conf import settings
+
+from .interning import Interner
+from .models import APIHeaderValue
+
+
+# always cleaned, whatever the view's sensitive_fields
+SENSITIVE_HEADERS = {'authorization', 'proxy_authorization', 'cookie', 'x_api_key', 'x_csrftoken'}
+# CGI names of the headers which are not prefixed with HTTP_ in request.META
+UNPREFIXED_HEADERS = {'CONTENT_LENGTH', 'CONTENT_TYPE'}
+
+header_values = Interner(APIHeaderValue)
+
+
+def get_meta_key(name):
+    """'User-Agent' -> 'HTTP_USER_AGENT'"""
+    key = name.upper().replace('-', '_')
+    return key if key in UNPREFIXED_HEADERS else 'HTTP_' + key
+
+
+def encode(headers, using):
+    """
+    Serialize headers as compact JSON.
+
+    The values of `DRF_TRACKING_INTERNED_HEADERS` are replaced by the id of
+    their `APIHeaderValue`, values too long for it are kept inline.
+    """
+    if not headers:
+        return None
+    interned = {name.lower() for name in getattr(settings, 'DRF_TRACKING_INTERNED_HEADERS', ('User-Agent',))}
+    max_length = APIHeaderValue._meta.get_field('value').max_length
+    encoded = {}
+    for name, value in headers.items():
+        if name.lower() in interned and len(value) <= max_length:
+            value = header_values.get_id(value, using)
+        encoded[name] = value
+    return json.dumps(encoded, separators=(',', ':'), sort_keys=True)
@@ -0,0 +1,34 @@
+from django.db import transaction
+
+
+class Interner(object):
+    """
+    Map values to the primary keys of their rows in a lookup table.
+
+    Known ids are cached per process and database, so repeated values cost no
+    query. An id is only cached once the transaction creating its row commits.
+    Extra keyword arguments select the rows of a table shared by several kinds
+    of values.
+    """
+
+    def __init__(self, model, field='value', maxsize=10000, **filters):
+        self.model = model
+        self.field = field
+        self.maxsize = maxsize
+        self.filters = filters
+        self._ids = {}
+
+    def get_id(self, value, using):
+        key = (using, value)
+        pk = self._ids.get(key)
+        if pk is None:
+            pk = self.model.objects.using(using).get_or_create(**dict(self.filters, **{self.field: value}))[0].pk
+            transaction.on_commit(lambda: self._cache(key, pk), using=using)
+        return pk
+
+    def clear(self):
+        self._ids.clear()
+
+    def _cache(self, key, pk):
+        if len(self._ids) < self.maxsize:
+            self._ids[key] = pk
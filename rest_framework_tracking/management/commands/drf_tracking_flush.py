@@ -0,0 +1,91 @@
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from rest_framework_tracking import ringbuffer, serialization
+from rest_framework_tracking.mixins import save_logs
+from rest_framework_tracking.routers import get_write_database
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert the logs of RingBufferLoggingMixin from the shared ring buffer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=getattr(settings, 'DRF_TRACKING_QUEUE_BATCH_SIZE', 500))
+        parser.add_argument('--interval', type=float,
+                            default=getattr(settings, 'DRF_TRACKING_QUEUE_FLUSH_INTERVAL', 1.0),
+                            help='seconds to wait when the buffer is empty')
+        parser.add_argument('--stale-timeout', type=float, default=5.0,
+                            help='seconds after which a record left partially written is skipped')
+        parser.add_argument('--max-attempts', type=int, default=3,
+                            help='attempts at a batch before saving its logs one by one, skipping those failing')
+        parser.add_argument('--once', action='store_true', help='flush the buffer then exit')
+
+    def handle(self, *args, **options):
+        buffer = ringbuffer.get_ring_buffer()
+        lock = ringbuffer.lock_reader(buffer.path)
+        if lock is None:
+            raise CommandError('Another drf_tracking_flush is reading {}.'.format(buffer.path))
+        self.skipped = 0
+        try:
+            self.flush(buffer, options)
+        finally:
+            os.close(lock)
+
+    def flush(self, buffer, options):
+        attempts = 0
+        while True:
+            records, position = buffer.read(options['batch_size'], options['stale_timeout'])
+            if records:
+                close_old_connections()
+                try:
+                    save_logs([serialization.loads(record) for record in records])
+                except Exception:
+                    attempts += 1
+                    logger.exception('Flushing %d logs raise exception!', len(records))
+                    if attempts < options['max_attempts'] or not self.database_is_usable():
+                        # the records stay in the buffer until the database is back
+                        time.sleep(options['interval'])
+                        continue
+                    # the database works but not with this batch: isolate the logs failing
+                    if not self.save_one_by_one(records):
+                        time.sleep(options['interval'])
+                        continue
+                attempts = 0
+            buffer.commit(position)
+            if len(records) < options['batch_size']:
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+
+    def save_one_by_one(self, records):
+        """Save the records one by one, skip those failing, return False if the database failed meanwhile."""
+        skipped = 0
+        for record in records:
+            try:
+                save_logs([serialization.loads(record)])
+            except Exception:
+                if not self.database_is_usable():
+                    return False
+                logger.exception('Skipping a log failing to save!')
+                skipped += 1
+        if skipped:
+            self.skipped += skipped
+            logger.error('Skipped %d logs of a batch failing to save, %d since the start.', skipped, self.skipped)
+        return True
+
+    def database_is_usable(self):
+        connection = connections[get_write_database()]
+        try:
+            connection.ensure_connection()
+            return connection.is_usable()
+        except Exception:
+            return False
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework_tracking import spool
+from rest_framework_tracking.mixins import save_logs_to_database
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert the logs spooled while the database was failing, by processes which are not running anymore.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=getattr(settings, 'DRF_TRACKING_QUEUE_BATCH_SIZE', 500))
+
+    def handle(self, *args, **options):
+        if not spool.is_enabled():
+            raise CommandError('DRF_TRACKING_SPOOL_DIR is not set.')
+        if not spool.get_spool().replay(save_logs_to_database, options['batch_size']):
+            raise CommandError('Replaying the spooled logs failed, they are spooled again.')
@@ -0,0 +1,56 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from rest_framework_tracking.filters import LogFilters
+from rest_framework_tracking.tail import LogTail, get_logs
+
+
+class Command(BaseCommand):
+    help = 'Print the logs as they are written.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', help='dotted view name')
+        parser.add_argument('--status-code', help='status codes, comma separated')
+        parser.add_argument('--user', help='user id')
+        parser.add_argument('--backlog', type=int, default=10, help='number of past logs to print first')
+        parser.add_argument('--interval', type=float,
+                            default=getattr(settings, 'DRF_TRACKING_TAIL_INTERVAL', 1.0),
+                            help='seconds between polls')
+        parser.add_argument('--duration', type=float, help='seconds after which to exit, none by default')
+        parser.add_argument('--json', action='store_true', help='print logs as JSON lines')
+
+    def handle(self, *args, **options):
+        try:
+            filters = LogFilters.from_params({
+                'view': options['view'],
+                'status_code': options['status_code'],
+                'user': options['user'],
+            })
+        except ValidationError as e:
+            raise CommandError(e.detail)
+        # a single watcher: poll in this thread
+        tail = LogTail(interval=options['interval'], autostart=False)
+        watcher = tail.watch(filters)
+        if options['backlog']:
+            for log in get_logs(limit=options['backlog'], filters=filters, newest=True):
+                if log['id'] <= tail.last_id:
+                    self.print_log(log, options['json'])
+        deadline = None if options['duration'] is None else time.time() + options['duration']
+        while True:
+            tail.poll()
+            for log in watcher.get():
+                self.print_log(log, options['json'])
+            self.stdout.flush()
+            if deadline is not None and time.time() + options['interval'] > deadline:
+                break
+            time.sleep(options['interval'])
+
+    def print_log(self, log, as_json):
+        if as_json:
+            self.stdout.write(json.dumps(log, separators=(',', ':'), default=str))
+        else:
+            self.stdout.write('{requested_at} {status_code} {method} {path} {view} {response_ms}ms user={user}'.format(**log))
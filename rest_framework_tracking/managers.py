@@ -1,6 +1,69 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import Avg, Count, F, Max, Sum
+from django.db.models.functions import Coalesce
+
+from .networks import get_packed_range
+from .routers import can_join_users
 
 
 class PrefetchUserManager(models.Manager):
     def get_queryset(self):
-        return super(PrefetchUserManager, self).get_queryset().select_related('user')
+        queryset = super(PrefetchUserManager, self).get_queryset()
+        if getattr(settings, 'DRF_TRACKING_USER_SNAPSHOT', False):
+            # username and user_email are stored with the log
+            return queryset
+        if not can_join_users(self.model):
+            # a join can't reach the users of another database
+            return queryset.prefetch_related('user')
+        return queryset.select_related('user')
+
+
+class APIRequestLogQuerySet(models.QuerySet):
+    def with_dimensions(self):
+        """
+        Annotate `view_name`, `view_method_name`, `host_name` and `method_name`,
+        whether they are stored in dimension tables or not.
+        """
+        return self.annotate(**{
+            name + '_name': Coalesce(name + '_dimension__value', name, output_field=models.CharField())
+            for name in ('view', 'view_method', 'host', 'method')
+        })
+
+    def from_network(self, cidr):
+        """Requests from the addresses of a network, e.g. '192.0.2.0/24', with DRF_TRACKING_PACKED_IP."""
+        first, last = get_packed_range(cidr)
+        return self.filter(remote_addr_packed__gte=first, remote_addr_packed__lte=last)
+
+    def values_by_view(self):
+        """values() grouped by the view name, under the `view` or `view_dimension__value` key."""
+        if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+            return self.values('view_dimension__value')
+        return self.values('view')
+
+    def memory_by_view(self):
+        """Memory allocation of the requests tracked by `memory_sample_rate`, per view."""
+        return self.filter(memory_peak__isnull=False).values_by_view().annotate(
+            requests=Count('id'),
+            avg_memory_peak=Avg('memory_peak'),
+            max_memory_peak=Max('memory_peak'),
+            avg_memory_net=Avg('memory_net'),
+        ).order_by('-max_memory_peak')
+
+    def bandwidth_by_view(self):
+        """Bytes received and sent per view, the views sending the most first."""
+        return self.values_by_view().annotate(
+            requests=Count('id'),
+            request_bytes=Sum('request_size'),
+            response_bytes=Sum('response_size'),
+            avg_response_size=Avg('response_size'),
+            avg_response_ms=Avg('response_ms'),
+        ).order_by(F('response_bytes').desc(nulls_last=True))
+
+    def by_route(self):
+        """Requests and response times per URL pattern, the busiest first."""
+        return self.filter(route__isnull=False).values('route__value').annotate(
+            requests=Count('id'),
+            avg_response_ms=Avg('response_ms'),
+            max_response_ms=Max('response_ms'),
+        ).order_by('-requests')
@@ -0,0 +1,80 @@
+import threading
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+# tracemalloc is process wide: it runs while at least one request is tracked,
+# tracing the allocations of the other threads' requests too
+_lock = threading.Lock()
+_active = 0
+_started = False
+
+
+class AllocationTracker(object):
+    """
+    Measure the memory allocated while tracking a request.
+
+    `peak` is the highest memory allocated above the starting point and `net`
+    the memory still allocated at the end. When `peak` reaches `top_threshold`
+    bytes, `top` lists the `top_limit` code locations holding the most memory
+    allocated during the request, as of its end.
+    Concurrent requests of the same process share tracemalloc's counters: their
+    measures are then best-effort, counting each other's allocations and frees,
+    and the peak of a request may be reached before it started.
+    """
+
+    def __init__(self, top_threshold=None, top_limit=10):
+        self.top_threshold = top_threshold
+        self.top_limit = top_limit
+        self.peak = None
+        self.net = None
+        self.top = None
+        self._start_current = 0
+        self._start_snapshot = None
+
+    def start(self):
+        global _active, _started
+        with _lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started = True
+            if _active == 0 and hasattr(tracemalloc, 'reset_peak'):  # Python >= 3.9
+                # not while other requests are tracked, it would lose their peak
+                tracemalloc.reset_peak()
+            _active += 1
+        if self.top_threshold:
+            self._start_snapshot = self._take_snapshot()
+        self._start_current = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        global _active, _started
+        current, peak = tracemalloc.get_traced_memory()
+        self.net = current - self._start_current
+        self.peak = max(peak - self._start_current, 0)
+        if self._start_snapshot is not None and self.peak >= self.top_threshold:
+            self.top = self._get_top()
+        self._start_snapshot = None
+        with _lock:
+            _active -= 1
+            if _active == 0 and _started:
+                tracemalloc.stop()
+                _started = False
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _get_top(self):
+        differences = self._take_snapshot().compare_to(self._start_snapshot, 'lineno')
+        return '\n'.join(
+            '{}:{}: {} B in {} blocks'.format(
+                difference.traceback[0].filename, difference.traceback[0].lineno,
+                difference.size_diff, difference.count_diff,
+            )
+            for difference in differences[:self.top_limit] if difference.size_diff > 0
+        )
@@ -0,0 +1,59 @@
+import os
+
+from django.http import HttpResponse
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+
+# Buckets in seconds, fine grained around typical API response times.
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5, 10.0, float('inf'))
+
+if prometheus_client is not None:
+    # With PROMETHEUS_MULTIPROC_DIR set, prometheus_client keeps the values in per-process
+    # mmap-backed files which metrics_view aggregates, so pre-fork servers report every worker.
+    REQUESTS = prometheus_client.Counter(
+        'drf_tracking_requests_total', 'Tracked API requests.',
+        ['view', 'view_method', 'status'],
+    )
+    LATENCY = prometheus_client.Histogram(
+        'drf_tracking_response_seconds', 'Tracked API response time in seconds.',
+        ['view', 'view_method'], buckets=LATENCY_BUCKETS,
+    )
+
+# labelled children, `labels()` is comparatively slow on the hot path
+_request_counters = {}
+_latency_histograms = {}
+
+
+def is_available():
+    return prometheus_client is not None
+
+
+def observe(view, view_method, status_code, response_ms):
+    """Count a request and record its response time."""
+    key = (view, view_method, status_code)
+    counter = _request_counters.get(key)
+    if counter is None:
+        counter = _request_counters[key] = REQUESTS.labels(view or '', view_method or '', str(status_code))
+    counter.inc()
+
+    key = (view, view_method)
+    histogram = _latency_histograms.get(key)
+    if histogram is None:
+        histogram = _latency_histograms[key] = LATENCY.labels(view or '', view_method or '')
+    histogram.observe(response_ms / 1000.0)
+
+
+def metrics_view(request):
+    """Expose the metrics in the Prometheus text format."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ or 'prometheus_multiproc_dir' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry),
+                        content_type=prometheus_client.CONTENT_TYPE_LATEST)
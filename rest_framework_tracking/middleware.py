@@ -0,0 +1,157 @@
+import json
+import logging
+import re
+import sys
+
+from django.conf import settings
+from django.http.request import RawPostDataException
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from rest_framework.views import APIView
+
+from . import tracing
+from .base_mixins import CAPTURE_FULL, CAPTURE_METADATA, BaseLoggingMixin
+from .mixins import LoggingMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoggingMiddleware(object):
+    """
+    Log DRF views without adding a mixin to each of them.
+
+    Views are selected by path (`DRF_TRACKING_MIDDLEWARE_PATHS`, regular expressions
+    matched against the path) or by dotted name (`DRF_TRACKING_MIDDLEWARE_VIEWS`).
+    The response time covers every middleware listed after this one.
+    Views already using a logging mixin are left to the mixin.
+    """
+
+    mixin_class = LoggingMixin
+    sensitive_fields = {}
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+        paths = getattr(settings, 'DRF_TRACKING_MIDDLEWARE_PATHS', ())
+        self.path_regex = re.compile('|'.join('(?:%s)' % path for path in paths)) if paths else None
+        self.views = frozenset(getattr(settings, 'DRF_TRACKING_MIDDLEWARE_VIEWS', ()))
+
+    def __call__(self, request):
+        if self.views or (self.path_regex is not None and self.path_regex.match(request.path_info)):
+            # the tracker is only built once process_view selects the view
+            request._tracking_requested_at = now()
+        response = self.get_response(request)
+        tracker = getattr(request, '_tracking_logger', None)
+        if tracker is not None:
+            try:
+                self.finalize_log(tracker, request, response)
+            except Exception:
+                # as in the mixins, a failure to log doesn't fail the request
+                logger.exception('Logging API call raise exception!')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        requested_at = getattr(request, '_tracking_requested_at', None)
+        if requested_at is None:
+            return None
+
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None or not issubclass(view_class, APIView) or issubclass(view_class, BaseLoggingMixin):
+            return None
+        view_name = view_class.__module__ + '.' + view_class.__name__
+        if view_name not in self.views and not (
+                self.path_regex is not None and self.path_regex.match(request.path_info)):
+            return None
+
+        tracker = self.mixin_class()
+        tracker.sensitive_fields = self.sensitive_fields
+        tracker.log = {'requested_at': requested_at}
+        tracker._start_trace(request)
+        request._tracking_logger = tracker
+        method = request.method.lower()
+        actions = getattr(view_func, 'actions', None)
+        if actions is not None:
+            view_method = actions.get(method)
+            handled = view_method is not None
+        else:
+            view_method = method
+            handled = hasattr(view_class, method)
+        tracker.log['view'] = view_name if handled else None
+        tracker.log['view_method'] = view_method
+        # read the body before the view consumes the stream
+        try:
+            request.body
+        except RawPostDataException:
+            pass
+        return None
+
+    def process_exception(self, request, exception):
+        tracker = getattr(request, '_tracking_logger', None)
+        if tracker is not None:
+            # formatted once the capture level is known, as by the mixins
+            tracker._exception = (exception, sys.exc_info()[2])
+
+    def finalize_log(self, tracker, request, response):
+        if not tracker.should_log(request, response):
+            return
+
+        response_ms = tracker._get_response_ms()
+        capture_level = tracker.get_capture_level(response_ms, response.status_code)
+        tracker.log.update(
+            {
+                'remote_addr': tracker._get_ip_address(request),
+                'path': request.path,
+                'route': tracker._get_route(request),
+                'host': request.get_host(),
+                'method': request.method,
+                'user_id': tracker._get_user_id(request),
+                'response_ms': response_ms,
+                'status_code': response.status_code,
+                'request_size': tracker._get_request_size(request),
+                'response_size': tracker._get_response_size(response),
+                'content_type': tracker._get_content_type(response),
+            }
+        )
+        if tracker.snapshot_user:
+            tracker.log['username'], tracker.log['user_email'] = tracker._get_user_snapshot(request)
+        if capture_level != CAPTURE_METADATA:
+            tracker.log['headers'] = tracker._get_headers(request)
+            tracker.log['query_params'] = tracker._clean_data(request.GET.dict())
+        if capture_level == CAPTURE_FULL:
+            data = tracker._clean_data(self._get_data(request))
+            tracker.log['data'] = data
+            tracker.log['response'] = None if response.streaming else tracker._clean_data(response.content)
+            if tracker.log['query_params'] == {}:
+                tracker.log['query_params'] = data
+            tracker._capture_exception()
+        if tracker.export_spans:
+            tracing.span_queue.put(tracing.build_span(tracker.log, tracker.parent_span_id))
+        tracker._persist_log(response)
+
+    def _get_data(self, request):
+        try:
+            body = request.body
+        except RawPostDataException:
+            return request.POST.dict()
+        if not body:
+            return {}
+        if request.content_type == 'application/json':
+            try:
+                return json.loads(body.decode(errors='replace'))
+            except ValueError:
+                return body
+        if request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            return request.POST.dict()
+        return body
+
+
+def exception_handler(exc, context):
+    """
+    Record the exceptions DRF handles for LoggingMiddleware, then handle them
+    with `DRF_TRACKING_EXCEPTION_HANDLER`, DRF's exception handler by default.
+    """
+    tracker = getattr(context.get('request'), '_tracking_logger', None)
+    if tracker is not None:
+        tracker._exception = (exc, sys.exc_info()[2])
+    handler = getattr(settings, 'DRF_TRACKING_EXCEPTION_HANDLER', 'rest_framework.views.exception_handler')
+    return import_string(handler)(exc, context)
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0007_merge_20180419_1646'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='span_id',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='trace_id',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0008_add_trace_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIErrorGroup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('traceback', models.TextField()),
+            ],
+            options={
+                'verbose_name': 'API Error Group',
+            },
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='error_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=40, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0009_add_error_groups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apierrorgroup',
+            name='count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='apierrorgroup',
+            name='first_seen',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='apierrorgroup',
+            name='last_seen',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='apierrorgroup',
+            name='sample_log',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='rest_framework_tracking.APIRequestLog'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0010_add_error_group_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIRequestProfile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('samples', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('log', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to='rest_framework_tracking.APIRequestLog')),
+            ],
+            options={
+                'verbose_name': 'API Request Profile',
+            },
+        ),
+    ]
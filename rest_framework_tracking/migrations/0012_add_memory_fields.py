@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0011_add_request_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='memory_net',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='memory_peak',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='memory_top',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0012_add_memory_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIHeaderValue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name': 'API Header Value',
+            },
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='headers',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0013_add_request_headers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='content_type',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='request_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='response_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
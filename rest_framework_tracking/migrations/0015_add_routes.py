@@ -0,0 +1,29 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0014_add_size_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIRoute',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'verbose_name': 'API Route',
+            },
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='route',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='rest_framework_tracking.APIRoute'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0015_add_routes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIDimension',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=16)),
+                ('value', models.CharField(max_length=255)),
+            ],
+            options={
+                'verbose_name': 'API Dimension',
+                'unique_together': {('kind', 'value')},
+            },
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='host_dimension',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='rest_framework_tracking.APIDimension'),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='method_dimension',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='rest_framework_tracking.APIDimension'),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='view_dimension',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='rest_framework_tracking.APIDimension'),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='view_method_dimension',
+            field=models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='rest_framework_tracking.APIDimension'),
+        ),
+    ]
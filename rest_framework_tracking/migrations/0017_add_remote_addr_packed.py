@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0016_add_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='remote_addr_packed',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
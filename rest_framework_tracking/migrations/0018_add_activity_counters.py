@@ -0,0 +1,28 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0017_add_remote_addr_packed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIActivityCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=8)),
+                ('key', models.CharField(max_length=45)),
+                ('bucket', models.DateTimeField()),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'API Activity Counter',
+                'unique_together': {('kind', 'key', 'bucket')},
+            },
+        ),
+    ]
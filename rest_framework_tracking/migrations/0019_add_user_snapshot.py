@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0018_add_activity_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='user_email',
+            field=models.EmailField(blank=True, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirequestlog',
+            name='username',
+            field=models.CharField(blank=True, max_length=150, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0019_add_user_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apirequestlog',
+            index=models.Index(fields=['requested_at', 'id'], name='drf_tracking_requested_id'),
+        ),
+    ]
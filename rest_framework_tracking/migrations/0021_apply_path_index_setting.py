@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from rest_framework_tracking.operations import AlterIndexBySetting
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0020_add_requested_at_id_index'),
+    ]
+
+    operations = [
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='path',
+            index_name='drf_tracking_path',
+            setting='DRF_TRACKING_PATH_INDEX',
+            default=True,
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+from rest_framework_tracking.operations import AlterIndexBySetting
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0021_apply_path_index_setting'),
+    ]
+
+    # with DRF_TRACKING_DIMENSION_TABLES, the view and view method are looked up by their dimension ids
+    operations = [
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='view',
+            index_name='drf_tracking_view',
+            setting='DRF_TRACKING_DIMENSION_TABLES',
+            index_when=False,
+        ),
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='view_method',
+            index_name='drf_tracking_view_method',
+            setting='DRF_TRACKING_DIMENSION_TABLES',
+            index_when=False,
+        ),
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='view_dimension',
+            index_name='drf_tracking_view_dim',
+            setting='DRF_TRACKING_DIMENSION_TABLES',
+        ),
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='view_method_dimension',
+            index_name='drf_tracking_view_method_dim',
+            setting='DRF_TRACKING_DIMENSION_TABLES',
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from rest_framework_tracking.operations import AlterIndexBySetting
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest_framework_tracking', '0022_apply_dimension_tables_setting'),
+    ]
+
+    operations = [
+        AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='remote_addr_packed',
+            index_name='drf_tracking_packed_ip',
+            setting='DRF_TRACKING_PACKED_IP',
+        ),
+    ]
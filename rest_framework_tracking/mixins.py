@@ -1,5 +1,57 @@
+from django.conf import settings
+
+from . import counters, errors, headers, networks, profiling, ringbuffer, serialization, spool
 from .base_mixins import BaseLoggingMixin
-from .models import APIRequestLog
+from .interning import Interner
+from .models import APIDimension, APIRequestLog, APIRequestProfile, APIRoute
+from .queues import BatchQueue
+from .routers import get_write_database
+
+route_ids = Interner(APIRoute)
+dimension_ids = {
+    name: Interner(APIDimension, kind=name)
+    for name in ('view', 'view_method', 'host', 'method')
+}
+
+
+def encode_log(log, using):
+    """Replace the values of a log dict stored in lookup tables by their ids."""
+    log['headers'] = headers.encode(log.get('headers'), using)
+    error_traceback = log.pop('error_traceback', None)
+    if error_traceback is not None:
+        errors.add_traceback(log['error_fingerprint'], error_traceback)
+    route = log.pop('route', None)
+    log['route_id'] = route_ids.get_id(route, using) if route else None
+    if getattr(settings, 'DRF_TRACKING_PACKED_IP', False):
+        log['remote_addr_packed'] = networks.pack(log['remote_addr'])
+    if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+        for name, interner in dimension_ids.items():
+            value = log.get(name)
+            log[name + '_dimension_id'] = interner.get_id(value, using) if value else None
+            # host and method are not nullable
+            log[name] = '' if name in ('host', 'method') else None
+
+
+def save_logs(logs):
+    """Bulk insert a batch of log dicts, spooled while the database is failing with DRF_TRACKING_SPOOL_DIR."""
+    if spool.is_enabled():
+        copies = [dict(log) for log in logs]
+        spool.save_or_spool(lambda: save_logs_to_database(copies), logs)
+    else:
+        save_logs_to_database(logs)
+
+
+def save_logs_to_database(logs):
+    """Bulk insert a batch of log dicts."""
+    database = get_write_database()
+    for log in logs:
+        encode_log(log, database)
+    logs = APIRequestLog.objects.using(database).bulk_create(
+        [APIRequestLog(**log) for log in logs]
+    )
+    errors.save_error_groups(logs, database)
+    if getattr(settings, 'DRF_TRACKING_ACTIVITY_COUNTERS', False):
+        counters.count_requests(logs, database)
 
 
 class LoggingMixin(BaseLoggingMixin):
@@ -9,7 +61,25 @@ class LoggingMixin(BaseLoggingMixin):
 
         Defaults on saving the data on the db.
         """
-        APIRequestLog(**self.log).save()
+        if spool.is_enabled():
+            spool.save_or_spool(self._save_log, [dict(self.log)])
+        else:
+            self._save_log()
+
+    def _save_log(self):
+        database = get_write_database()
+        encode_log(self.log, database)
+        log = APIRequestLog(**self.log)
+        log.save(using=database)
+        errors.save_error_groups([log], database)
+        if getattr(settings, 'DRF_TRACKING_ACTIVITY_COUNTERS', False):
+            counters.count_requests([log], database)
+        if self.profile is not None:
+            APIRequestProfile.objects.using(database).create(
+                log=log,
+                samples=self.profile.samples,
+                data=profiling.compress(self.profile.folded()),
+            )
 
 
 class LoggingErrorsMixin(LoggingMixin):
@@ -19,3 +89,45 @@ class LoggingErrorsMixin(LoggingMixin):
 
     def should_log(self, request, response):
         return response.status_code >= 400
+
+
+class QueuedLoggingMixin(LoggingMixin):
+    """
+    Hand logs over to a background thread which bulk inserts them.
+
+    The request never waits on the database nor touches its transaction.
+    """
+
+    log_queue = BatchQueue(
+        save_logs,
+        maxsize=getattr(settings, 'DRF_TRACKING_QUEUE_SIZE', 10000),
+        batch_size=getattr(settings, 'DRF_TRACKING_QUEUE_BATCH_SIZE', 500),
+        flush_interval=getattr(settings, 'DRF_TRACKING_QUEUE_FLUSH_INTERVAL', 1.0),
+    )
+
+    def _persist_log(self, response):
+        self.handle_log()
+
+    def handle_log(self):
+        self.log_queue.put(self.log)
+
+
+class RingBufferLoggingMixin(LoggingMixin):
+    """
+    Append logs to a ring buffer in a memory-mapped file shared by the workers
+    of the host, which the `drf_tracking_flush` command bulk inserts.
+
+    Workers neither open a database connection nor run a thread for logging.
+    """
+
+    def __init__(self, *args, **kwargs):
+        assert ringbuffer.fcntl, 'RingBufferLoggingMixin requires a POSIX system.'
+        assert getattr(settings, 'DRF_TRACKING_RING_BUFFER_PATH', None), \
+            'RingBufferLoggingMixin requires DRF_TRACKING_RING_BUFFER_PATH.'
+        super(RingBufferLoggingMixin, self).__init__(*args, **kwargs)
+
+    def _persist_log(self, response):
+        self.handle_log()
+
+    def handle_log(self):
+        ringbuffer.get_ring_buffer().put(serialization.dumps(self.log))
@@ -1,5 +1,133 @@
+import json
+
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils.timezone import now
+from six import python_2_unicode_compatible
+
+from . import profiling
 from .base_models import BaseAPIRequestLog
+from .routers import get_write_database
 
 
 class APIRequestLog(BaseAPIRequestLog):
-    pass
+    class Meta(BaseAPIRequestLog.Meta):
+        # keyset pagination order, see views.APIRequestLogPagination
+        indexes = [models.Index(fields=['requested_at', 'id'], name='drf_tracking_requested_id')]
+
+    def get_headers(self):
+        """Return the logged request headers, interned values resolved."""
+        if not self.headers:
+            return {}
+        headers = json.loads(self.headers)
+        ids = [value for value in headers.values() if isinstance(value, int)]
+        if ids:
+            values = dict(APIHeaderValue.objects.using(self._state.db).filter(pk__in=ids).values_list('pk', 'value'))
+            headers = {
+                name: values.get(value) if isinstance(value, int) else value
+                for name, value in headers.items()
+            }
+        return headers
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def unset_deleted_user(sender, instance, **kwargs):
+    """Unset the user of the logs of a deleted user, in the logs' database."""
+    APIRequestLog.objects.using(get_write_database()).filter(user_id=instance.pk).update(user=None)
+
+
+@python_2_unicode_compatible
+class APIRoute(models.Model):
+    """ URL pattern of the logged requests, e.g. `api/users/<int:pk>/` """
+    value = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = 'API Route'
+
+    def __str__(self):
+        return self.value
+
+
+@python_2_unicode_compatible
+class APIDimension(models.Model):
+    """ View, view method, host or HTTP method of the logged requests, with DRF_TRACKING_DIMENSION_TABLES """
+    kind = models.CharField(max_length=16)
+    value = models.CharField(max_length=255)
+
+    class Meta:
+        verbose_name = 'API Dimension'
+        unique_together = ('kind', 'value')
+
+    def __str__(self):
+        return self.value
+
+
+@python_2_unicode_compatible
+class APIHeaderValue(models.Model):
+    """ Header value shared by the logs, e.g. a user agent """
+    value = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = 'API Header Value'
+
+    def __str__(self):
+        return self.value
+
+
+@python_2_unicode_compatible
+class APIErrorGroup(models.Model):
+    """ Logged errors grouped by fingerprint, with their traceback and occurrence counters """
+    fingerprint = models.CharField(max_length=40, unique=True)
+    traceback = models.TextField()
+    first_seen = models.DateTimeField(default=now)
+    last_seen = models.DateTimeField(default=now, db_index=True)
+    count = models.PositiveIntegerField(default=0)
+    sample_log = models.ForeignKey(
+        APIRequestLog,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
+    class Meta:
+        verbose_name = 'API Error Group'
+
+    def __str__(self):
+        return self.traceback.rstrip().rsplit('\n', 1)[-1]
+
+
+@python_2_unicode_compatible
+class APIActivityCounter(models.Model):
+    """ Requests and errors of a user or an IP address in a time bucket, with DRF_TRACKING_ACTIVITY_COUNTERS """
+    kind = models.CharField(max_length=8)
+    key = models.CharField(max_length=45)
+    bucket = models.DateTimeField()
+    requests = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'API Activity Counter'
+        unique_together = ('kind', 'key', 'bucket')
+
+    def __str__(self):
+        return '{} {} {}'.format(self.kind, self.key, self.bucket)
+
+
+class APIRequestProfile(models.Model):
+    """ Statistical profile of a slow request, as compressed folded stacks """
+    log = models.OneToOneField(
+        APIRequestLog,
+        on_delete=models.CASCADE,
+        related_name='profile',
+    )
+    samples = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    class Meta:
+        verbose_name = 'API Request Profile'
+
+    def get_folded_stacks(self):
+        return profiling.decompress(self.data)
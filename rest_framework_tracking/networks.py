@@ -0,0 +1,84 @@
+import six
+
+try:
+    import ipaddress
+except ImportError:  # Python 2 without the ipaddress backport
+    ipaddress = None
+
+
+# IPv4 addresses are stored as IPv4-mapped IPv6 addresses, so that all addresses sort in a single range
+IPV4_MAPPED_PREFIX = 0xffff << 32
+
+_network_sets = {}
+
+
+class NetworkSet(object):
+    """
+    Membership test of IP addresses in a list of CIDRs.
+
+    Networks are precompiled to integer (mask, network) pairs grouped by prefix
+    length, so an address is tested with one set lookup per distinct prefix length.
+    """
+
+    def __init__(self, cidrs):
+        networks = {}
+        for cidr in cidrs:
+            network = ipaddress.ip_network(six.text_type(cidr), strict=False)
+            key = (network.version, int(network.netmask))
+            networks.setdefault(key, set()).add(int(network.network_address))
+        self._networks = {4: [], 6: []}
+        for (version, mask), addresses in sorted(networks.items()):
+            self._networks[version].append((mask, frozenset(addresses)))
+
+    def __contains__(self, address):
+        try:
+            ip = ipaddress.ip_address(six.text_type(address.strip()))
+        except ValueError:
+            return False
+        value = int(ip)
+        return any(value & mask in addresses for mask, addresses in self._networks[ip.version])
+
+
+def get_network_set(cidrs):
+    """Return the NetworkSet of cidrs, compiled once per process."""
+    key = tuple(cidrs)
+    network_set = _network_sets.get(key)
+    if network_set is None:
+        network_set = _network_sets[key] = NetworkSet(key)
+    return network_set
+
+
+def get_client_address(remote_addr, forwarded_for, trusted_proxies):
+    """
+    Return the client address: the last address of the X-Forwarded-For chain
+    which is not a trusted proxy, starting from the address connected to us.
+    """
+    if not forwarded_for or remote_addr not in trusted_proxies:
+        return remote_addr
+    addresses = [address.strip() for address in forwarded_for.split(',')]
+    for address in reversed(addresses):
+        if address not in trusted_proxies:
+            return address
+    return addresses[0]
+
+
+def pack(address):
+    """
+    16 bytes representation of an address in hex, None if it is invalid.
+
+    Hex digits of a fixed width sort as the addresses do, and unlike binary
+    columns, text columns can be indexed by every database.
+    """
+    try:
+        ip = ipaddress.ip_address(six.text_type(address))
+    except ValueError:
+        return None
+    if ip.version == 4:
+        return '{:032x}'.format(IPV4_MAPPED_PREFIX | int(ip))
+    return '{:032x}'.format(int(ip))
+
+
+def get_packed_range(cidr):
+    """(first, last) packed addresses of a network."""
+    network = ipaddress.ip_network(six.text_type(cidr), strict=False)
+    return pack(network.network_address), pack(network.broadcast_address)
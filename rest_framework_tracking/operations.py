@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import models
+from django.db.migrations.operations.base import Operation
+
+
+class AlterIndexBySetting(Operation):
+    """
+    Create or drop the index of a field as a setting asks, when migrating.
+
+    The model state keeps the index the field declares whatever the setting,
+    so that migrations don't depend on the settings they are made with.
+    Migrating backwards restores the declared index.
+    """
+
+    reversible = True
+
+    def __init__(self, model_name, name, index_name, setting, default=False, index_when=True):
+        self.model_name = model_name
+        self.name = name
+        self.index_name = index_name
+        self.setting = setting
+        self.default = default
+        self.index_when = index_when
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        indexed = bool(getattr(settings, self.setting, self.default)) == self.index_when
+        self._alter_index(app_label, schema_editor, to_state, indexed)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        self._alter_index(app_label, schema_editor, to_state, model._meta.get_field(self.name).db_index)
+
+    def describe(self):
+        return 'Index {}.{} as {} asks'.format(self.model_name, self.name, self.setting)
+
+    def _alter_index(self, app_label, schema_editor, state, indexed):
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        index_names = get_index_names(schema_editor.connection, model._meta.db_table, field.column)
+        if indexed and not index_names:
+            schema_editor.add_index(model, models.Index(fields=[field.name], name=self.index_name))
+        elif not indexed:
+            for index_name in index_names:
+                # Django names the indexes it creates beyond what models.Index accepts
+                schema_editor.execute(schema_editor.sql_delete_index % {
+                    'table': schema_editor.quote_name(model._meta.db_table),
+                    'name': schema_editor.quote_name(index_name),
+                })
+
+
+def get_index_names(connection, table, column):
+    """The names of the plain indexes on column alone."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return sorted(
+        name for name, constraint in constraints.items()
+        if constraint['index'] and constraint['columns'] == [column] and not (
+            constraint['unique'] or constraint['primary_key'] or constraint['foreign_key'])
+    )
@@ -0,0 +1,61 @@
+import collections
+import sys
+import threading
+import zlib
+
+try:
+    from threading import get_ident
+except ImportError:  # Python 2
+    from thread import get_ident
+
+
+class Sampler(object):
+    """
+    Statistical profiler of the thread that started it.
+
+    A background thread samples the thread's stack every `interval` seconds,
+    so the profiled code runs at full speed. Stacks are aggregated in the
+    folded format (`outer;inner count` per line) understood by flamegraph.pl,
+    speedscope and most flame graph viewers.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = 0
+        self.stacks = collections.Counter()
+        self._thread_id = get_ident()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='drf-tracking-sampler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('{} ({}:{})'.format(code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        return '\n'.join('{} {}'.format(stack, count) for stack, count in self.stacks.most_common())
+
+
+def compress(profile):
+    return zlib.compress(profile.encode('utf-8'))
+
+
+def decompress(data):
+    return zlib.decompress(bytes(data)).decode('utf-8')
@@ -0,0 +1,91 @@
+import atexit
+import logging
+import os
+import threading
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchQueue(object):
+    """
+    Bounded in-memory queue drained in batches by a daemon thread.
+
+    `put` never blocks, so it is safe to call from an event loop: when the
+    queue is full the item is dropped and counted in `dropped` rather than
+    making the API call wait on a slow sink.
+    """
+
+    def __init__(self, handler, maxsize=10000, batch_size=500, flush_interval=1.0, autostart=True):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.autostart = autostart
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def put(self, item):
+        """Enqueue item, return False if it was dropped."""
+        if self.autostart:
+            self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self):
+        """Drain the queue in the calling thread."""
+        batch = self._get_batch(block=False)
+        while batch:
+            self._handle(batch)
+            batch = self._get_batch(block=False)
+
+    def _ensure_started(self):
+        # the worker thread doesn't survive a fork (pre-fork servers), restart it in the child
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._run, name='drf-tracking-queue')
+            self._thread.daemon = True
+            self._thread.start()
+            if self._pid is None:
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            batch = self._get_batch(block=True)
+            if batch:
+                # honor CONN_MAX_AGE and recover from broken connections, like a request would
+                close_old_connections()
+                self._handle(batch)
+
+    def _get_batch(self, block):
+        batch = []
+        try:
+            batch.append(self._queue.get(block, self.flush_interval))
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _handle(self, batch):
+        try:
+            self.handler(batch)
+        except Exception:
+            logger.exception('Handling a batch of %d items raise exception!', len(batch))
@@ -0,0 +1,194 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DRFTRING'
+# magic, capacity, write position, read position, dropped records
+HEADER = struct.Struct('<8sQQQQ')
+HEADER_SIZE = 64
+# payload length, payload CRC32, state, reserved
+RECORD_HEADER = struct.Struct('<IIII')
+ALIGNMENT = 8
+
+WRITING = 1
+COMMITTED = 2
+PADDING = 3
+
+
+def _align(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class RingBuffer(object):
+    """
+    Ring buffer of byte records in a memory-mapped file shared by processes.
+
+    Any number of processes and threads append records; a single consumer
+    reads them in order. Positions are monotonic byte counters, taken modulo
+    the capacity. A writer reserves its record under a lock, marking it as
+    being written, then copies the payload and its CRC32 outside the lock and
+    marks it committed last. A record whose writer died before committing is
+    skipped by the reader after `stale_timeout` seconds, and a committed record
+    failing its CRC is skipped as well. When the buffer is full, records are
+    dropped and counted in `dropped` rather than making the request wait.
+    """
+
+    def __init__(self, path, size=64 * 1024 * 1024):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._stale_since = {}
+        with self._lock():
+            if os.fstat(self._fd).st_size < HEADER_SIZE:
+                os.ftruncate(self._fd, HEADER_SIZE + _align(size))
+                self._mmap = mmap.mmap(self._fd, 0)
+                HEADER.pack_into(self._mmap, 0, MAGIC, _align(size), 0, 0, 0)
+            else:
+                self._mmap = mmap.mmap(self._fd, 0)
+        magic, self.capacity = HEADER.unpack_from(self._mmap, 0)[:2]
+        assert magic == MAGIC, '{} is not a ring buffer.'.format(path)
+
+    @property
+    def dropped(self):
+        return HEADER.unpack_from(self._mmap, 0)[4]
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+
+    def put(self, payload):
+        """Append a record, return False if it was dropped."""
+        size = _align(RECORD_HEADER.size + len(payload))
+        with self._lock():
+            magic, capacity, write_pos, read_pos, dropped = HEADER.unpack_from(self._mmap, 0)
+            offset = write_pos % capacity
+            padding = capacity - offset if offset + size > capacity else 0
+            if write_pos + padding + size - read_pos > capacity:
+                HEADER.pack_into(self._mmap, 0, magic, capacity, write_pos, read_pos, dropped + 1)
+                return False
+            if padding:
+                if padding >= RECORD_HEADER.size:
+                    RECORD_HEADER.pack_into(self._mmap, HEADER_SIZE + offset, 0, 0, PADDING, 0)
+                write_pos += padding
+                offset = 0
+            start = HEADER_SIZE + offset
+            RECORD_HEADER.pack_into(self._mmap, start, len(payload), 0, WRITING, 0)
+            HEADER.pack_into(self._mmap, 0, magic, capacity, write_pos + size, read_pos, dropped)
+        self._mmap[start + RECORD_HEADER.size:start + RECORD_HEADER.size + len(payload)] = payload
+        # the state is written last: a committed record is complete
+        RECORD_HEADER.pack_into(self._mmap, start, len(payload), zlib.crc32(payload) & 0xffffffff, COMMITTED, 0)
+        return True
+
+    def read(self, max_records=500, stale_timeout=5.0):
+        """
+        Return (records, position) of the committed records following the read position.
+
+        Pass position to `commit` once the records are stored.
+        """
+        with self._lock():
+            capacity, write_pos, read_pos = HEADER.unpack_from(self._mmap, 0)[1:4]
+        records = []
+        position = read_pos
+        while position < write_pos and len(records) < max_records:
+            offset = position % capacity
+            remaining = capacity - offset
+            if remaining < RECORD_HEADER.size:
+                position += remaining
+                continue
+            start = HEADER_SIZE + offset
+            length, crc, state = RECORD_HEADER.unpack_from(self._mmap, start)[:3]
+            if state == PADDING:
+                position += remaining
+                continue
+            size = _align(RECORD_HEADER.size + length)
+            if state == WRITING:
+                since = self._stale_since.setdefault(position, time.time())
+                if time.time() - since < stale_timeout:
+                    # being written, keep the order
+                    break
+                logger.warning('Skipping a log record left partially written at %d.', position)
+            elif state == COMMITTED and size <= remaining:
+                payload = bytes(self._mmap[start + RECORD_HEADER.size:start + RECORD_HEADER.size + length])
+                if zlib.crc32(payload) & 0xffffffff == crc:
+                    records.append(payload)
+                else:
+                    logger.warning('Skipping a corrupted log record at %d.', position)
+            else:
+                logger.error('Corrupted ring buffer at %d, skipping %d bytes.', position, write_pos - position)
+                position = write_pos
+                break
+            self._stale_since.pop(position, None)
+            position += size
+        return records, position
+
+    def commit(self, position):
+        """Free the space of the records read up to position."""
+        with self._lock():
+            magic, capacity, write_pos, read_pos, dropped = HEADER.unpack_from(self._mmap, 0)
+            HEADER.pack_into(self._mmap, 0, magic, capacity, write_pos, position, dropped)
+
+    def _lock(self):
+        return _FileLock(self._fd, self._thread_lock)
+
+
+class _FileLock(object):
+    """Exclusive lock between the threads (threading lock) and processes (POSIX lock) using a file."""
+
+    def __init__(self, fd, thread_lock):
+        self.fd = fd
+        self.thread_lock = thread_lock
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, HEADER_SIZE)
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self.fd, fcntl.LOCK_UN, HEADER_SIZE)
+        self.thread_lock.release()
+
+
+def lock_reader(path):
+    """
+    Lock `<path>.lock` for the single reader of the ring buffer at path.
+
+    Return the file descriptor holding the lock, to close once done, or None
+    when another process holds it.
+    """
+    fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except (IOError, OSError):
+        os.close(fd)
+        return None
+    return fd
+
+
+_ring_buffer = None
+_ring_buffer_pid = None
+
+
+def get_ring_buffer():
+    """The ring buffer of `DRF_TRACKING_RING_BUFFER_PATH`, opened once per process."""
+    global _ring_buffer, _ring_buffer_pid
+    if _ring_buffer_pid != os.getpid():
+        # a forked worker reopens it, not to share the parent's locks
+        _ring_buffer = RingBuffer(
+            settings.DRF_TRACKING_RING_BUFFER_PATH,
+            getattr(settings, 'DRF_TRACKING_RING_BUFFER_SIZE', 64 * 1024 * 1024),
+        )
+        _ring_buffer_pid = os.getpid()
+    return _ring_buffer
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, router
+
+
+APP_LABEL = 'rest_framework_tracking'
+
+
+def get_write_database():
+    """Database alias the request logs are written to."""
+    return getattr(settings, 'DRF_TRACKING_DATABASE', None) or DEFAULT_DB_ALIAS
+
+
+def get_read_database():
+    """Database alias the request logs are read from, e.g. a read replica."""
+    return getattr(settings, 'DRF_TRACKING_READ_DATABASE', None) or get_write_database()
+
+
+def can_join_users(model):
+    """Whether model is read from the database of the users, so that its queries can join them."""
+    return router.db_for_read(model) == router.db_for_read(get_user_model())
+
+
+class TrackingRouter(object):
+    """
+    Database router sending the tracking models to their own databases.
+
+    Writes go to `DRF_TRACKING_DATABASE` and reads (admin, analytics) go to
+    `DRF_TRACKING_READ_DATABASE`, which is typically a replica of the former.
+    Add it to `DATABASE_ROUTERS` before any catch-all router.
+    """
+
+    def _is_tracking_model(self, model):
+        return model._meta.app_label == APP_LABEL
+
+    def _db_for_related(self, route, model, hints):
+        # Django would look the user of a log up in the log's database
+        instance = hints.get('instance')
+        if instance is not None and self._is_tracking_model(type(instance)):
+            return route(model)
+        return None
+
+    def db_for_read(self, model, **hints):
+        if self._is_tracking_model(model):
+            return get_read_database()
+        return self._db_for_related(router.db_for_read, model, hints)
+
+    def db_for_write(self, model, **hints):
+        if self._is_tracking_model(model):
+            return get_write_database()
+        return self._db_for_related(router.db_for_write, model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # logs reference users living in another database
+        if self._is_tracking_model(type(obj1)) or self._is_tracking_model(type(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == APP_LABEL:
+            return db == get_write_database()
+        return None
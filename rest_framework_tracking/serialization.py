@@ -0,0 +1,190 @@
+import datetime
+import json
+from collections import namedtuple
+
+import six
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from django.utils.dateparse import parse_datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# parses what isoformat() writes much faster than parse_datetime, on Python 3.7+
+_parse_isoformat = getattr(datetime.datetime, 'fromisoformat', parse_datetime)
+
+
+# Fields are only ever appended: records written by older versions decode with
+# the missing fields set to None.
+FIELDS = (
+    'requested_at',  # datetime, serialized in ISO 8601
+    'user_id',  # user primary key or None
+    'response_ms',  # int
+    'path',  # str
+    'route',  # str or None, interned when saved
+    'view',  # str or None
+    'view_method',  # str or None
+    'remote_addr',  # str
+    'host',  # str
+    'method',  # str
+    'query_params',  # str or None
+    'headers',  # dict of str or None, encoded when saved
+    'data',  # str or None
+    'response',  # str or None
+    'errors',  # str or None
+    'error_fingerprint',  # str or None
+    'status_code',  # int or None
+    'request_size',  # int or None
+    'response_size',  # int or None
+    'content_type',  # str or None
+    'trace_id',  # str or None
+    'span_id',  # str or None
+    'memory_peak',  # int or None
+    'memory_net',  # int or None
+    'memory_top',  # str or None
+    'username',  # str or None
+    'user_email',  # str or None
+    'error_traceback',  # str or None, the first time a process captures a fingerprint, not a model field
+)
+VERSION = 1
+
+# TextField values stored as their str(), as the model would
+TEXT_FIELDS = ('query_params', 'data', 'response', 'errors')
+
+_USER_ID = FIELDS.index('user_id')
+
+# values JSON doesn't have, e.g. a request body in bytes, are encoded as their str()
+_json_encoder = json.JSONEncoder(separators=(',', ':'), default=six.text_type)
+
+
+class LogRecord(namedtuple('LogRecord', FIELDS)):
+    """
+    A log as the backends which are not the database carry it, a tuple of its fields.
+
+    It encodes to a row, `[VERSION, <FIELDS values>]`, of JSON types only.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, **fields):
+        values = [fields.pop(name, None) for name in FIELDS]
+        assert not fields, 'Unknown log fields: {}.'.format(', '.join(sorted(fields)))
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def from_log(cls, log):
+        """
+        Build a record from the log dict of a mixin.
+
+        The text fields keep their values, e.g. dicts of query parameters:
+        `to_log` turns them into text, out of the request.
+        """
+        values = list(map(log.get, FIELDS))
+        user = log.get('user')
+        if user is not None:
+            values[_USER_ID] = user.pk
+        return tuple.__new__(cls, values)
+
+    def to_log(self):
+        """Return the log dict save_logs takes, without the fields left to their model default."""
+        log = {name: value for name, value in zip(FIELDS, self) if value is not None}
+        for name in TEXT_FIELDS:
+            value = log.get(name)
+            if value is not None and not isinstance(value, six.string_types):
+                log[name] = six.text_type(value)
+        return log
+
+    def to_row(self):
+        row = [VERSION]
+        row.extend(self)
+        row[1] = row[1].isoformat()
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        assert row[0] == VERSION, 'Unknown log record version {}.'.format(row[0])
+        values = row[1:]
+        # rows written before the last fields were appended
+        values.extend([None] * (len(FIELDS) - len(values)))
+        values[0] = _parse_isoformat(values[0])
+        return tuple.__new__(cls, values)
+
+
+class JSONCodec(object):
+    """JSON rows, encoded by orjson when it is installed."""
+
+    name = 'json'
+
+    def encode(self, row):
+        if orjson is not None:
+            try:
+                return orjson.dumps(row, default=six.text_type)
+            except orjson.JSONEncodeError:
+                # e.g. an integer beyond 64 bits in a request body, which orjson
+                # would also decode as a float: the leading space keeps it to json
+                return b' ' + _json_encoder.encode(row).encode('utf-8')
+        return _json_encoder.encode(row).encode('utf-8')
+
+    def decode(self, data):
+        if orjson is not None and data[:1] == b'[':
+            return orjson.loads(data)
+        return json.loads(data.decode('utf-8'))
+
+
+class MsgpackCodec(object):
+    """MessagePack rows, requires msgpack."""
+
+    name = 'msgpack'
+
+    def encode(self, row):
+        return msgpack.packb(row, use_bin_type=True, default=six.text_type)
+
+    def decode(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS = {codec.name: codec for codec in (JSONCodec(), MsgpackCodec())}
+
+
+_default_codec = None
+
+
+def get_codec(name=None):
+    """The codec of `name`, `DRF_TRACKING_SERIALIZER` by default."""
+    global _default_codec
+    if name is None:
+        # looking the setting up costs more than encoding a row
+        if _default_codec is None:
+            _default_codec = get_codec(getattr(settings, 'DRF_TRACKING_SERIALIZER', 'json'))
+        return _default_codec
+    assert name in CODECS, 'Unknown serializer {}, use one of {}.'.format(name, ', '.join(sorted(CODECS)))
+    assert name != 'msgpack' or msgpack is not None, 'The msgpack serializer requires msgpack.'
+    return CODECS[name]
+
+
+@receiver(setting_changed)
+def _reset_default_codec(setting, **kwargs):
+    global _default_codec
+    if setting == 'DRF_TRACKING_SERIALIZER':
+        _default_codec = None
+
+
+def dumps(log, codec=None):
+    """Serialize a log dict or LogRecord to bytes, for the logging backends which are not the database."""
+    if not isinstance(log, LogRecord):
+        log = LogRecord.from_log(log)
+    return get_codec(codec).encode(log.to_row())
+
+
+def loads(data):
+    """Deserialize a log dict, as save_logs takes it, whichever codec serialized it."""
+    row = get_codec('json' if data[:1] in (b'[', b' ') else 'msgpack').decode(data)
+    return LogRecord.from_row(row).to_log()
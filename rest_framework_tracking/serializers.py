@@ -0,0 +1,44 @@
+from rest_framework import serializers
+
+from .models import APIRequestLog
+
+
+class DimensionField(serializers.CharField):
+    """A view, view method, host or method, as annotated by APIRequestLogQuerySet.with_dimensions() if it was."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super(DimensionField, self).__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        # with DRF_TRACKING_DIMENSION_TABLES, the field of the log is empty
+        name = self.source + '_name'
+        if hasattr(instance, name):
+            return getattr(instance, name)
+        return super(DimensionField, self).get_attribute(instance)
+
+
+class APIRequestLogSerializer(serializers.ModelSerializer):
+    """The fields to list logs by, none of the request or response contents."""
+
+    view = DimensionField()
+    view_method = DimensionField()
+    method = DimensionField()
+
+    class Meta:
+        model = APIRequestLog
+        fields = ('id', 'requested_at', 'user', 'method', 'path', 'view', 'view_method',
+                  'status_code', 'response_ms', 'remote_addr')
+        read_only_fields = fields
+
+
+class APIRequestLogDetailSerializer(APIRequestLogSerializer):
+    host = DimensionField()
+    headers = serializers.DictField(source='get_headers', read_only=True)
+
+    class Meta(APIRequestLogSerializer.Meta):
+        fields = APIRequestLogSerializer.Meta.fields + (
+            'host', 'username', 'user_email', 'headers', 'query_params', 'data', 'response', 'errors',
+            'error_fingerprint', 'request_size', 'response_size', 'content_type', 'trace_id', 'span_id',
+        )
+        read_only_fields = fields
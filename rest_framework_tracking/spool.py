@@ -0,0 +1,292 @@
+import atexit
+import errno
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections
+
+from . import serialization
+
+
+logger = logging.getLogger(__name__)
+
+# payload length, payload CRC32
+RECORD_HEADER = struct.Struct('<II')
+SUFFIX = '.spool'
+# the errors of an unavailable database, the others are caused by the logs
+CONNECTION_ERRORS = (InterfaceError, OperationalError)
+
+
+class CircuitBreaker(object):
+    """
+    Stop calling a failing service for a while.
+
+    The breaker opens after `failure_threshold` consecutive failures. Once
+    `reset_timeout` seconds have passed, a single call is let through: its
+    success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        """Return True if the service may be called."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset_timeout:
+                # half open: let this call through, keep the others out
+                self.opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self):
+        """Return True if the breaker was open."""
+        with self._lock:
+            was_open = self.opened_at is not None
+            self.failures = 0
+            self.opened_at = None
+            return was_open
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.time()
+
+
+class Spool(object):
+    """
+    Append-only files of serialized logs, one per process, in `directory`.
+
+    Appends are written at once and fsynced at most every `fsync_interval`
+    seconds, and at exit. A record cut short by a crash is ignored on replay,
+    as is a record failing its CRC32.
+    """
+
+    def __init__(self, directory, fsync_interval=1.0):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fd = None
+        self._pid = None
+        self._last_fsync = 0
+        self.spooled = False
+        atexit.register(self.sync)
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, '{}{}'.format(os.getpid(), SUFFIX))
+
+    def extend(self, logs):
+        data = b''.join(_frame(serialization.dumps(log)) for log in logs)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                self._pid = os.getpid()
+            os.write(self._fd, data)
+            self.spooled = True
+            if time.time() - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._fd)
+                self._last_fsync = time.time()
+
+    def sync(self):
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.fsync(self._fd)
+                self._last_fsync = time.time()
+
+    def replay(self, save, batch_size=500):
+        """
+        Save the logs spooled by this process and by dead processes in batches.
+
+        The logs of a batch failing while the database is available are saved one
+        by one, those failing are dropped. Return False if the database failed,
+        the logs left are then spooled again.
+        """
+        for path in self._claim():
+            records = _read_records(path)
+            for start in range(0, len(records), batch_size):
+                batch = records[start:start + batch_size]
+                try:
+                    save([serialization.loads(record) for record in batch])
+                except CONNECTION_ERRORS:
+                    logger.exception('Replaying %d spooled logs raise exception!', len(records) - start)
+                    self._append_records(records[start:])
+                    os.remove(path)
+                    return False
+                except Exception:
+                    logger.exception('Replaying %d spooled logs raise exception, saving them one by one!', len(batch))
+                    failed = self._save_one_by_one(save, batch)
+                    if failed is not None:
+                        self._append_records(batch[failed:] + records[start + batch_size:])
+                        os.remove(path)
+                        return False
+            os.remove(path)
+        return True
+
+    def _save_one_by_one(self, save, records):
+        """Save the records one by one, drop those failing, return the index of the first one left if the database failed."""
+        for i, record in enumerate(records):
+            try:
+                save([serialization.loads(record)])
+            except CONNECTION_ERRORS:
+                logger.exception('Replaying a spooled log raise exception!')
+                return i
+            except Exception:
+                logger.exception('Dropping a spooled log failing to save!')
+        return None
+
+    def _claim(self):
+        """Rename the files to replay, so that no other process replays them."""
+        with self._lock:
+            # the next appends go to a new file
+            if self._fd is not None and self._pid == os.getpid():
+                os.fsync(self._fd)
+                os.close(self._fd)
+            self._fd = self._pid = None
+            self.spooled = False
+        claimed = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                pid = int(name[:-len(SUFFIX)])
+            except ValueError:
+                continue
+            if pid != os.getpid() and _is_alive(pid):
+                continue
+            path = os.path.join(self.directory, name)
+            claimed_path = '{}.replaying.{}.{}'.format(path, os.getpid(), time.time())
+            try:
+                os.rename(path, claimed_path)
+            except OSError:
+                # claimed by another process
+                continue
+            claimed.append(claimed_path)
+        return claimed
+
+    def _append_records(self, records):
+        data = b''.join(_frame(record) for record in records)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            # to be replayed on the next success
+            self.spooled = True
+
+
+def _frame(payload):
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload) & 0xffffffff) + payload
+
+
+def _read_records(path):
+    with open(path, 'rb') as spool_file:
+        data = spool_file.read()
+    records = []
+    position = 0
+    while position + RECORD_HEADER.size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, position)
+        payload = data[position + RECORD_HEADER.size:position + RECORD_HEADER.size + length]
+        if len(payload) < length:
+            logger.warning('Ignoring a spooled log cut short in %s.', path)
+            break
+        if zlib.crc32(payload) & 0xffffffff == crc:
+            records.append(payload)
+        else:
+            logger.warning('Ignoring a corrupted spooled log in %s.', path)
+        position += RECORD_HEADER.size + length
+    return records
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+breaker = CircuitBreaker(
+    failure_threshold=getattr(settings, 'DRF_TRACKING_BREAKER_THRESHOLD', 5),
+    reset_timeout=getattr(settings, 'DRF_TRACKING_BREAKER_RESET_TIMEOUT', 30.0),
+)
+_spool = None
+_replay_lock = threading.Lock()
+
+
+def is_enabled():
+    return bool(getattr(settings, 'DRF_TRACKING_SPOOL_DIR', None))
+
+
+def get_spool():
+    global _spool
+    if _spool is None:
+        _spool = Spool(
+            settings.DRF_TRACKING_SPOOL_DIR,
+            getattr(settings, 'DRF_TRACKING_SPOOL_FSYNC_INTERVAL', 1.0),
+        )
+    return _spool
+
+
+def save_or_spool(save, logs):
+    """
+    Call save() unless the breaker is open, spool logs if it is or if the database fails.
+
+    Once save() succeeds again, the spooled logs are replayed by a background thread.
+    The other errors of save() are raised: the database works, spooling the logs would
+    only fail their replay. `logs` must not be modified by save().
+    """
+    if not breaker.allow():
+        get_spool().extend(logs)
+        return
+    try:
+        save()
+    except CONNECTION_ERRORS:
+        breaker.record_failure()
+        logger.exception('Logging API call raise exception, spooling the log!')
+        get_spool().extend(logs)
+        return
+    except Exception:
+        # the database answered
+        breaker.record_success()
+        raise
+    if breaker.record_success() or (_spool is not None and _spool.spooled):
+        _start_replay()
+
+
+def _start_replay():
+    if not _replay_lock.acquire(False):
+        # already replaying
+        return
+    thread = threading.Thread(target=_replay, name='drf-tracking-replay')
+    thread.daemon = True
+    thread.start()
+
+
+def _replay():
+    from .mixins import save_logs_to_database
+
+    try:
+        close_old_connections()
+        if not get_spool().replay(save_logs_to_database):
+            breaker.record_failure()
+    finally:
+        close_old_connections()
+        _replay_lock.release()
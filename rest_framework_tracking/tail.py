@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import Max
+
+from .models import APIRequestLog
+from .serializers import APIRequestLogSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_logs(after_id=None, limit=500, filters=None, newest=False):
+    """
+    Serialize up to limit logs with an id greater than after_id, by increasing id.
+
+    With newest, the last logs rather than the first ones.
+    """
+    queryset = APIRequestLog.objects.select_related(None).prefetch_related(None).defer(
+        'headers', 'query_params', 'data', 'response', 'errors', 'memory_top')
+    if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+        queryset = queryset.with_dimensions()
+    if after_id is not None:
+        queryset = queryset.filter(id__gt=after_id)
+    if filters is not None:
+        queryset = filters.filter(queryset)
+    if newest:
+        logs = list(queryset.order_by('-id')[:limit])[::-1]
+    else:
+        logs = list(queryset.order_by('id')[:limit])
+    return APIRequestLogSerializer(logs, many=True).data
+
+
+class Watcher(object):
+    """
+    The logs matching filters, as LogTail polls them.
+
+    The queue is bounded: logs a slow watcher doesn't get in time are dropped
+    and counted in `dropped`.
+    """
+
+    def __init__(self, filters=None, maxsize=1000):
+        self.filters = filters
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+
+    def put(self, log):
+        if self.filters is not None and not self.filters.matches(log):
+            return
+        try:
+            self._queue.put_nowait(log)
+        except queue.Full:
+            self.dropped += 1
+
+    def get(self, timeout=None):
+        """Return the logs received, waiting up to timeout seconds for the first one."""
+        logs = []
+        try:
+            logs.append(self._queue.get(timeout is not None, timeout))
+            while True:
+                logs.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return logs
+
+
+class LogTail(object):
+    """
+    Poll the logs written by any process, once for all the watchers of this process.
+
+    Each poll fetches the logs with an id greater than the last one seen, a
+    range scan of the primary key whatever the number of watchers, from a
+    daemon thread running while there are watchers. A log committed after a
+    log with a greater id, by a concurrent transaction, may be missed.
+    """
+
+    def __init__(self, interval=1.0, batch_size=500, autostart=True):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.autostart = autostart
+        self.last_id = None
+        self._watchers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def watch(self, filters=None, maxsize=1000):
+        """Return a Watcher of the logs written from now on, call unwatch once done."""
+        watcher = Watcher(filters, maxsize)
+        with self._lock:
+            running = self._thread is not None and self._pid == os.getpid()
+            if not running and not self._watchers:
+                # start from the logs written from now on, not those of a previous watch
+                self.last_id = APIRequestLog.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+            self._watchers.add(watcher)
+            if self.autostart and not running:
+                self._thread = threading.Thread(target=self._run, name='drf-tracking-tail')
+                self._thread.daemon = True
+                self._thread.start()
+                self._pid = os.getpid()
+        return watcher
+
+    def unwatch(self, watcher):
+        with self._lock:
+            self._watchers.discard(watcher)
+
+    def poll(self):
+        """Dispatch the logs written since the last poll to the watchers, return their number."""
+        logs = get_logs(self.last_id, self.batch_size)
+        if logs:
+            self.last_id = logs[-1]['id']
+            with self._lock:
+                watchers = list(self._watchers)
+            for log in logs:
+                for watcher in watchers:
+                    watcher.put(log)
+        return len(logs)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._watchers:
+                    self._thread = None
+                    connections.close_all()
+                    return
+            # honor CONN_MAX_AGE and recover from broken connections, like a request would
+            close_old_connections()
+            try:
+                count = self.poll()
+            except Exception:
+                logger.exception('Polling the logs raise exception!')
+                count = 0
+            if count < self.batch_size:
+                time.sleep(self.interval)
+
+
+log_tail = LogTail(
+    interval=getattr(settings, 'DRF_TRACKING_TAIL_INTERVAL', 1.0),
+    batch_size=getattr(settings, 'DRF_TRACKING_QUEUE_BATCH_SIZE', 500),
+)
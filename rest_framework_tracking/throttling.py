@@ -0,0 +1,133 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowCounter(object):
+    """
+    Count requests per key over sliding windows of each of `periods` seconds.
+
+    Each period is counted in fixed windows kept in a Django cache, and the count
+    of the last `period` seconds is estimated from the current and previous
+    windows, the latter weighted by how much of it the sliding window still
+    covers. A key costs two cache entries per period whatever its rate, and a
+    request one cache round trip per period. The cache is local or shared
+    between processes depending on its backend.
+    """
+
+    def __init__(self, periods=(60, 3600), cache='default', prefix='drf_tracking_rate'):
+        self.periods = tuple(periods)
+        self.cache = caches[cache]
+        self.prefix = prefix
+
+    def _get_window_key(self, key, period, window):
+        return '{}:{}:{}:{}'.format(self.prefix, period, window, key)
+
+    def incr(self, key, now=None):
+        """Count a request of key in every period."""
+        now = time.time() if now is None else now
+        for period in self.periods:
+            window_key = self._get_window_key(key, period, int(now // period))
+            try:
+                self.cache.incr(window_key)
+            except ValueError:
+                # the first request of the window
+                if not self.cache.add(window_key, 1, timeout=2 * period):
+                    # counted by another process in between
+                    self.cache.incr(window_key)
+
+    def get(self, key, period, now=None):
+        """Return (current window count, previous window count, elapsed fraction of the current window)."""
+        assert period in self.periods, 'Period {} is not counted, see DRF_TRACKING_RATE_PERIODS.'.format(period)
+        now = time.time() if now is None else now
+        window = int(now // period)
+        current_key = self._get_window_key(key, period, window)
+        previous_key = self._get_window_key(key, period, window - 1)
+        counts = self.cache.get_many([current_key, previous_key])
+        return counts.get(current_key, 0), counts.get(previous_key, 0), now % period / period
+
+    def count(self, key, period, now=None):
+        """Estimated number of requests of key in the last period seconds."""
+        current, previous, elapsed = self.get(key, period, now)
+        return current + previous * (1 - elapsed)
+
+
+_request_counter = None
+
+
+def get_default_periods():
+    """The period of the `tracking` throttle rate, else a minute and an hour."""
+    try:
+        period = TrackingRateThrottle().duration
+    except ImproperlyConfigured:
+        # no rate, the counts are only read by the project
+        period = None
+    return (period,) if period else (60, 3600)
+
+
+def get_request_counter():
+    """The counter shared by TrackingRateThrottle and the logging mixins."""
+    global _request_counter
+    if _request_counter is None:
+        periods = getattr(settings, 'DRF_TRACKING_RATE_PERIODS', None)
+        _request_counter = SlidingWindowCounter(
+            periods=periods or get_default_periods(),
+            cache=getattr(settings, 'DRF_TRACKING_RATE_CACHE', 'default'),
+        )
+    return _request_counter
+
+
+def get_counter_key(request, remote_addr):
+    """Count authenticated requests per user, others per IP address."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return 'user:{}'.format(user.pk)
+    return 'ip:{}'.format(remote_addr)
+
+
+class TrackingRateThrottle(SimpleRateThrottle):
+    """
+    Limit the requests of each user, or IP address for anonymous requests,
+    over a sliding window.
+
+    The requests are counted once, in the counter the logging mixins update
+    with `DRF_TRACKING_RATE_COUNTER`, so every counted view, throttled or not,
+    uses up the quota. The period of `rate` must be in `DRF_TRACKING_RATE_PERIODS`,
+    which defaults to the period of the `tracking` rate.
+    """
+
+    scope = 'tracking'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        counter = get_request_counter()
+        self.now = self.timer()
+        self.key = get_counter_key(request, self.get_remote_addr(request, view))
+        self.counts = counter.get(self.key, self.duration, self.now)
+        # the logging mixin must not count this request again
+        request._tracking_counted = True
+        current, previous, elapsed = self.counts
+        if current + previous * (1 - elapsed) >= self.num_requests:
+            return self.throttle_failure()
+        counter.incr(self.key, self.now)
+        return True
+
+    def get_remote_addr(self, request, view):
+        """Use the address the logging mixin resolves, if any."""
+        get_ip_address = getattr(view, '_get_ip_address', None)
+        if get_ip_address is not None:
+            return get_ip_address(request)
+        return self.get_ident(request)
+
+    def wait(self):
+        """Seconds until the estimated count is below the rate."""
+        current, previous, elapsed = self.counts
+        if current >= self.num_requests or not previous:
+            return (1 - elapsed) * self.duration
+        # the previous window's weight decreases until the estimate is below the rate
+        return max((1 - (self.num_requests - current) / float(previous) - elapsed) * self.duration, 0)
@@ -0,0 +1,113 @@
+import calendar
+import json
+import random
+import re
+
+try:
+    from urllib.request import Request, urlopen
+except ImportError:  # Python 2
+    from urllib2 import Request, urlopen
+
+from django.conf import settings
+from django.utils import timezone
+
+from .queues import BatchQueue
+
+
+TRACEPARENT_RE = re.compile(r'^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}')
+INVALID_TRACE_ID = '0' * 32
+INVALID_SPAN_ID = '0' * 16
+
+SPAN_KIND_SERVER = 2
+STATUS_CODE_UNSET = 0
+STATUS_CODE_ERROR = 2
+
+
+def new_trace_id():
+    return '%032x' % random.getrandbits(128)
+
+
+def new_span_id():
+    return '%016x' % random.getrandbits(64)
+
+
+def parse_traceparent(header):
+    """
+    Return (trace_id, parent_span_id) from a W3C `traceparent` header,
+    (None, None) if it is missing or invalid.
+    """
+    match = TRACEPARENT_RE.match(header or '')
+    if match is None:
+        return None, None
+    version, trace_id, span_id = match.groups()
+    if version == 'ff' or trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None, None
+    return trace_id, span_id
+
+
+def _to_unix_nano(value):
+    if timezone.is_naive(value):
+        # with USE_TZ = False, a local time of TIME_ZONE
+        value = timezone.make_aware(value)
+    return (calendar.timegm(value.utctimetuple()) * 1000000 + value.microsecond) * 1000
+
+
+def _attribute(key, value):
+    if isinstance(value, int):
+        # 64 bits integers are strings in OTLP/JSON
+        return {'key': key, 'value': {'intValue': str(value)}}
+    return {'key': key, 'value': {'stringValue': value}}
+
+
+def build_span(log, parent_span_id=None):
+    """Build an OTLP/JSON span out of a log."""
+    start = _to_unix_nano(log['requested_at'])
+    attributes = [
+        _attribute('http.method', log['method']),
+        _attribute('http.target', log['path']),
+        _attribute('http.host', log['host']),
+        _attribute('http.status_code', log['status_code']),
+    ]
+    if log.get('view'):
+        attributes.append(_attribute('drf.view', log['view']))
+    if log.get('view_method'):
+        attributes.append(_attribute('drf.view_method', log['view_method']))
+    span = {
+        'traceId': log['trace_id'],
+        'spanId': log['span_id'],
+        'name': '{} {}'.format(log['method'], log.get('view') or log['path']),
+        'kind': SPAN_KIND_SERVER,
+        'startTimeUnixNano': str(start),
+        'endTimeUnixNano': str(start + log['response_ms'] * 1000000),
+        'attributes': attributes,
+        'status': {'code': STATUS_CODE_ERROR if log['status_code'] >= 500 else STATUS_CODE_UNSET},
+    }
+    if parent_span_id:
+        span['parentSpanId'] = parent_span_id
+    return span
+
+
+def export_spans(spans):
+    """Send a batch of spans to the OTLP/HTTP collector at `DRF_TRACKING_OTLP_ENDPOINT`."""
+    payload = {
+        'resourceSpans': [{
+            'resource': {
+                'attributes': [
+                    _attribute('service.name', getattr(settings, 'DRF_TRACKING_SERVICE_NAME', 'drf-tracking')),
+                ],
+            },
+            'scopeSpans': [{
+                'scope': {'name': 'rest_framework_tracking'},
+                'spans': spans,
+            }],
+        }],
+    }
+    request = Request(
+        settings.DRF_TRACKING_OTLP_ENDPOINT,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    urlopen(request, timeout=getattr(settings, 'DRF_TRACKING_OTLP_TIMEOUT', 10)).close()
+
+
+span_queue = BatchQueue(export_spans, batch_size=512, flush_interval=5.0)
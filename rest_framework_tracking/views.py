@@ -0,0 +1,217 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from rest_framework import status, viewsets
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .base_mixins import _call_on_close
+from .filters import LogFilters
+from .models import APIRequestLog
+from .serializers import APIRequestLogDetailSerializer, APIRequestLogSerializer
+from .tail import get_logs, log_tail
+
+
+class APIRequestLogPagination(CursorPagination):
+    """
+    Keyset pagination on (requested_at, id), most recent first.
+
+    The cursor holds the key of the last log of the page, so each page is a
+    range scan of the (requested_at, id) index whatever its depth.
+    """
+
+    ordering = ('-requested_at', '-id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        self.position = self.cursor.position if self.cursor is not None else None
+
+        if reverse:
+            queryset = queryset.order_by('requested_at', 'id')
+        else:
+            queryset = queryset.order_by('-requested_at', '-id')
+        if self.position is not None:
+            requested_at, pk = self._decode_position(self.position)
+            lookup = 'gt' if reverse else 'lt'
+            after = Q(**{'requested_at__' + lookup: requested_at})
+            after |= Q(requested_at=requested_at, **{'id__' + lookup: pk})
+            # redundant with after, but a bound of the index range the OR can't give
+            queryset = queryset.filter(after, **{'requested_at__{}e'.format(lookup): requested_at})
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._encode_position(self.page[-1]) if self.page else self.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._encode_position(self.page[0]) if self.page else self.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _encode_position(self, log):
+        return '{}|{}'.format(log.requested_at.isoformat(), log.pk)
+
+    def _decode_position(self, position):
+        requested_at, _, pk = position.partition('|')
+        try:
+            requested_at = parse_datetime(requested_at)
+            pk = int(pk)
+        except ValueError:
+            requested_at = None
+        if requested_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return requested_at, pk
+
+
+class APIRequestLogViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Logs, most recent first, filtered by the query parameters:
+
+    - `view`: dotted view name
+    - `status_code`: one or more status codes, comma separated
+    - `user`: user id
+    - `since`, `until`: ISO 8601 date-times, `since` included, `until` excluded
+
+    Responses carry an ETag of the logs they list: polling with If-None-Match
+    gets a 304 until a log is added to the page.
+    """
+
+    queryset = APIRequestLog.objects.select_related(None).prefetch_related(None)
+    serializer_class = APIRequestLogSerializer
+    pagination_class = APIRequestLogPagination
+    permission_classes = (IsAdminUser,)
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return APIRequestLogDetailSerializer
+        return self.serializer_class
+
+    def get_queryset(self):
+        queryset = super(APIRequestLogViewSet, self).get_queryset()
+        if getattr(settings, 'DRF_TRACKING_DIMENSION_TABLES', False):
+            queryset = queryset.with_dimensions()
+        if self.action == 'list':
+            queryset = LogFilters.from_params(self.request.query_params).filter(queryset)
+            # not listed, and possibly large
+            queryset = queryset.defer('headers', 'query_params', 'data', 'response', 'errors', 'memory_top')
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        # logs don't change once written: the ids of the page identify its contents
+        etag = quote_etag(hashlib.md5('{}:{}'.format(
+            request.get_full_path(), ','.join(str(log.pk) for log in page),
+        ).encode('utf-8')).hexdigest())
+        return self._conditional_response(request, etag, lambda: self.get_paginated_response(
+            self.get_serializer(page, many=True).data))
+
+    def retrieve(self, request, *args, **kwargs):
+        log = self.get_object()
+        return self._conditional_response(request, quote_etag('log-{}'.format(log.pk)), lambda: Response(
+            self.get_serializer(log).data))
+
+    def _conditional_response(self, request, etag, get_response):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [value.strip() for value in if_none_match.split(',')] or if_none_match.strip() == '*':
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = get_response()
+        response['ETag'] = etag
+        return response
+
+
+def _event(name, data, event_id=None):
+    lines = ['id: {}'.format(event_id)] if event_id is not None else []
+    lines.append('event: {}'.format(name))
+    lines.append('data: {}'.format(json.dumps(data, separators=(',', ':'), default=str)))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Render the errors of an event stream, as an `error` event."""
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return _event('error', data)
+
+
+class APIRequestLogTailView(APIView):
+    """
+    Stream the logs as they are written, as server-sent events, for admin users.
+
+    Takes the `view`, `status_code` and `user` filters of APIRequestLogViewSet.
+    Each `log` event has the log id as event id: a client reconnecting with
+    Last-Event-ID first gets up to `backlog_size` of the logs it missed. All the
+    streams of a process share the polling of `tail.log_tail`.
+    """
+
+    permission_classes = (IsAdminUser,)
+    renderer_classes = (EventStreamRenderer,)
+    backlog_size = 500
+    heartbeat_interval = getattr(settings, 'DRF_TRACKING_TAIL_HEARTBEAT', 15.0)
+
+    def get(self, request):
+        filters = LogFilters.from_params(request.query_params)
+        # watch before reading the backlog, not to miss the logs written in between
+        watcher = log_tail.watch(filters)
+        backlog = []
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID')
+        if last_event_id:
+            try:
+                backlog = get_logs(int(last_event_id), self.backlog_size, filters)
+            except ValueError:
+                pass
+        response = StreamingHttpResponse(self.stream(watcher, backlog), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # don't let nginx buffer the events
+        response['X-Accel-Buffering'] = 'no'
+        # also when the stream is closed before it started
+        _call_on_close(response, lambda: log_tail.unwatch(watcher))
+        return response
+
+    def stream(self, watcher, backlog):
+        try:
+            last_id = 0
+            for log in backlog:
+                last_id = log['id']
+                yield _event('log', log, log['id'])
+            while True:
+                logs = watcher.get(self.heartbeat_interval)
+                if not logs:
+                    # detects closed connections
+                    yield b': keep-alive\n\n'
+                for log in logs:
+                    if log['id'] > last_id:
+                        yield _event('log', log, log['id'])
+        finally:
+            log_tail.unwatch(watcher)
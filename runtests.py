@@ -12,7 +12,7 @@ PYTEST_ARGS = {
     'fast': ['tests', '-q'],
 }
 
-FLAKE8_ARGS = ['rest_framework_tracking', 'tests', '--ignore=E501']
+FLAKE8_ARGS = ['rest_framework_tracking', 'tests', 'benchmarks', '--ignore=E501']
 
 
 sys.path.append(os.path.dirname(__file__))
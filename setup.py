@@ -79,6 +79,11 @@ setup(
         'djangorestframework>=3',
         'pytz',
     ],
+    extras_require={
+        # orjson doesn't support older Pythons, the stdlib json encodes the rows there
+        'orjson': ['orjson; python_version >= "3.6"'],
+        'msgpack': ['msgpack'],
+    },
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Environment :: Web Environment',
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""A local stand-in for an OpenTelemetry collector receiving OTLP/HTTP JSON."""
+from __future__ import absolute_import
+
+import json
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class OTLPCollector(object):
+    """Collect the spans POSTed to `endpoint`, rejecting payloads which are not OTLP/JSON traces."""
+
+    def __init__(self):
+        self.resource_spans = []
+        self.errors = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                try:
+                    assert self.path == '/v1/traces', 'Unexpected path {}.'.format(self.path)
+                    assert self.headers['Content-Type'] == 'application/json'
+                    payload = json.loads(body.decode('utf-8'))
+                    for resource_spans in payload['resourceSpans']:
+                        for scope_spans in resource_spans['scopeSpans']:
+                            for span in scope_spans['spans']:
+                                assert len(span['traceId']) == 32 and len(span['spanId']) == 16
+                                assert int(span['startTimeUnixNano']) <= int(span['endTimeUnixNano'])
+                    collector.resource_spans.extend(payload['resourceSpans'])
+                except Exception as e:
+                    collector.errors.append(e)
+                    self.send_response(400)
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(b'{}')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.endpoint = 'http://127.0.0.1:{}/v1/traces'.format(self.server.server_address[1])
+
+    @property
+    def spans(self):
+        return [
+            span
+            for resource_spans in self.resource_spans
+            for scope_spans in resource_spans['scopeSpans']
+            for span in scope_spans['spans']
+        ]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
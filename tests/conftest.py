@@ -7,7 +7,9 @@ def pytest_configure():
     settings.configure(
         DEBUG_PROPAGATE_EXCEPTIONS=True,
         DATABASES={
-            'default': environ.Env().db(default="sqlite://")  # DATABASE_URL should be specified in the environment
+            'default': environ.Env().db(default="sqlite://"),  # DATABASE_URL should be specified in the environment
+            # a dedicated log database, see test_routers
+            'logs': environ.Env().db('LOGS_DATABASE_URL', default="sqlite://"),
         },
         SITE_ID=1,
         SECRET_KEY='not very secret in tests',
@@ -27,6 +29,7 @@ def pytest_configure():
             'django.contrib.messages.middleware.MessageMiddleware',
         ),
         INSTALLED_APPS=(
+            'django.contrib.admin',
             'django.contrib.auth',
             'django.contrib.contenttypes',
             'django.contrib.sessions',
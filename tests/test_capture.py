@@ -0,0 +1,48 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import ast
+import pytest
+from rest_framework.test import APITestCase
+from rest_framework_tracking.models import APIRequestLog
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCaptureLevels(APITestCase):
+    def test_metadata_only(self):
+        self.client.post('/metadata-logging?p1=a', {'val': 1}, format='json')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 200)
+        self.assertEqual(log.view, 'tests.views.MockMetadataLoggingView')
+        self.assertIsNone(log.query_params)
+        self.assertIsNone(log.data)
+        self.assertIsNone(log.response)
+
+    def test_client_error_not_escalated(self):
+        self.client.get('/metadata-logging', {'invalid': 1})
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 400)
+        self.assertIsNone(log.response)
+        self.assertIsNone(log.errors)
+
+    def test_server_error_escalated(self):
+        self.client.get('/metadata-logging', {'fail': 1})
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 500)
+        self.assertEqual(ast.literal_eval(log.query_params), {u'fail': u'1'})
+        self.assertIn('failure', log.response)
+        self.assertIn('APIException', log.errors)
+
+    def test_headers_level_keeps_query_params(self):
+        self.client.post('/headers-logging?p1=a', {'val': 1}, format='json')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(ast.literal_eval(log.query_params), {u'p1': u'a'})
+        self.assertIsNone(log.data)
+        self.assertIsNone(log.response)
+
+    def test_slow_request_escalated(self):
+        self.client.post('/escalated-logging', {'val': 1, 'password': '1234'}, format='json')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(ast.literal_eval(log.data), {u'val': 1, u'password': u'********************'})
+        self.assertEqual(log.response, u'"with metadata"')
@@ -0,0 +1,53 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import datetime
+import pytest
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_tracking import counters
+from rest_framework_tracking.models import APIActivityCounter
+
+
+class TestGetBucket(SimpleTestCase):
+    def test_bucket(self):
+        requested_at = datetime.datetime(2020, 1, 1, 10, 7, 42, 123)
+        self.assertEqual(counters.get_bucket(requested_at, 60), datetime.datetime(2020, 1, 1, 10, 7))
+        self.assertEqual(counters.get_bucket(requested_at, 3600), datetime.datetime(2020, 1, 1, 10))
+
+
+@pytest.mark.django_db
+@override_settings(DRF_TRACKING_ACTIVITY_COUNTERS=True)
+class TestActivityCounters(APITestCase):
+    def setUp(self):
+        counters._pending.clear()
+
+    def test_ip_counted(self):
+        self.client.get('/logging', REMOTE_ADDR='192.0.2.1')
+        self.client.get('/logging', REMOTE_ADDR='192.0.2.1')
+        self.client.get('/404-error-logging', REMOTE_ADDR='192.0.2.1')
+        counter = APIActivityCounter.objects.get()
+        self.assertEqual((counter.kind, counter.key), (counters.IP, '192.0.2.1'))
+        self.assertEqual((counter.requests, counter.errors), (3, 1))
+        self.assertEqual(counters.get_counts(counters.IP, '192.0.2.1', now() - datetime.timedelta(minutes=5)), (3, 1))
+
+    def test_user_counted(self):
+        user = User.objects.create_user(username='myname', password='secret')
+        self.client.login(username='myname', password='secret')
+        self.client.get('/session-auth-logging')
+        self.client.get('/session-auth-logging')
+        self.assertEqual(counters.get_counts(counters.USER, user.pk, now() - datetime.timedelta(minutes=5)), (2, 0))
+
+    @override_settings(DRF_TRACKING_COUNTER_FLUSH_INTERVAL=3600)
+    def test_coalesced(self):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.assertEqual(APIActivityCounter.objects.count(), 0)
+        counters.flush_counters('default')
+        self.assertEqual(APIActivityCounter.objects.get().requests, 2)
+
+    def test_get_counts_without_counter(self):
+        self.assertEqual(counters.get_counts(counters.IP, '192.0.2.9', now()), (0, 0))
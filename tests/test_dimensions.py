@@ -0,0 +1,93 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+from django.utils.timezone import now
+from rest_framework_tracking.mixins import dimension_ids, save_logs_to_database
+from rest_framework_tracking.models import APIDimension, APIRequestLog
+
+pytestmark = pytest.mark.django_db
+
+
+@override_settings(DRF_TRACKING_DIMENSION_TABLES=True)
+class TestDimensionTables(APITestCase):
+    def setUp(self):
+        for interner in dimension_ids.values():
+            interner.clear()
+
+    def test_dimensions_stored_in_lookup_table(self):
+        self.client.get('/logging')
+        log = APIRequestLog.objects.get()
+        self.assertIsNone(log.view)
+        self.assertIsNone(log.view_method)
+        self.assertEqual(log.host, '')
+        self.assertEqual(log.method, '')
+        self.assertEqual(log.view_dimension.value, 'tests.views.MockLoggingView')
+        self.assertEqual(log.view_method_dimension.value, 'get')
+        self.assertEqual(log.host_dimension.value, 'testserver')
+        self.assertEqual(log.method_dimension.value, 'GET')
+
+    def test_bulk_inserted_dimensions(self):
+        requested_at = now()
+        save_logs_to_database([
+            {'requested_at': requested_at, 'path': '/{}'.format(i), 'view': 'views.View{}'.format(i),
+             'remote_addr': '127.0.0.1', 'host': 'testserver', 'method': 'GET'}
+            for i in range(2)
+        ])
+        logs = APIRequestLog.objects.with_dimensions().order_by('path')
+        self.assertEqual([log.view_name for log in logs], ['views.View0', 'views.View1'])
+        self.assertEqual(APIDimension.objects.filter(kind='view').count(), 2)
+
+    def test_dimensions_shared(self):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.assertEqual(APIDimension.objects.count(), 4)
+        self.assertEqual(APIDimension.objects.filter(kind='method').get().value, 'GET')
+
+    def test_with_dimensions(self):
+        self.client.get('/logging')
+        log = APIRequestLog.objects.with_dimensions().get()
+        self.assertEqual(log.view_name, 'tests.views.MockLoggingView')
+        self.assertEqual(log.view_method_name, 'get')
+        self.assertEqual(log.host_name, 'testserver')
+        self.assertEqual(log.method_name, 'GET')
+
+    def test_bandwidth_by_view(self):
+        self.client.get('/logging')
+        rows = list(APIRequestLog.objects.bandwidth_by_view())
+        self.assertEqual(rows[0]['view_dimension__value'], 'tests.views.MockLoggingView')
+        self.assertEqual(rows[0]['requests'], 1)
+
+    def test_api(self):
+        self.client.get('/logging')
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        log = self.client.get('/logs/', {'view': 'tests.views.MockLoggingView'}).data['results'][0]
+        self.assertEqual(log['view'], 'tests.views.MockLoggingView')
+        self.assertEqual(log['method'], 'GET')
+
+    def test_admin(self):
+        self.client.get('/logging')
+        request = RequestFactory().get('/admin/rest_framework_tracking/apirequestlog/')
+        request.user = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        model_admin = admin.site._registry[APIRequestLog]
+        changelist = model_admin.get_changelist_instance(request)
+        self.assertIn('method_name', changelist.list_display)
+        log = changelist.result_list[0]
+        self.assertEqual(model_admin.method_name(log), 'GET')
+        self.assertEqual(model_admin.host_name(log), 'testserver')
+        method_filter = changelist.filter_specs[0]
+        self.assertEqual([value for pk, value in method_filter.lookup_choices], ['GET'])
+
+
+class TestWithoutDimensionTables(APITestCase):
+    def test_with_dimensions(self):
+        self.client.get('/logging')
+        log = APIRequestLog.objects.with_dimensions().get()
+        self.assertEqual(log.view_name, 'tests.views.MockLoggingView')
+        self.assertEqual(log.method_name, 'GET')
+        self.assertEqual(APIDimension.objects.count(), 0)
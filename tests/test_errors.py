@@ -0,0 +1,95 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+import time
+from django.test.utils import override_settings
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_tracking import errors
+from rest_framework_tracking.models import APIErrorGroup, APIRequestLog
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBoundedExceptionCapture(APITestCase):
+    def setUp(self):
+        errors._stored_fingerprints.clear()
+        errors._tracebacks.clear()
+        errors._occurrences.clear()
+
+    def test_expected_error_not_formatted(self):
+        self.client.post('/bounded-errors-logging')
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.status_code, 404)
+        self.assertEqual(log.errors, 'NotFound: Not found.')
+        self.assertIsNone(log.error_fingerprint)
+        self.assertEqual(APIErrorGroup.objects.count(), 0)
+
+    def test_traceback_stored_once(self):
+        self.client.get('/bounded-errors-logging')
+        self.client.get('/bounded-errors-logging')
+        first, second = APIRequestLog.objects.order_by('id')
+        self.assertEqual(first.errors, 'APIException: response')
+        self.assertEqual(len(first.error_fingerprint), 40)
+        self.assertEqual(first.error_fingerprint, second.error_fingerprint)
+
+        group = APIErrorGroup.objects.get()
+        self.assertEqual(group.fingerprint, first.error_fingerprint)
+        self.assertIn('Traceback', group.traceback)
+        self.assertEqual(str(group), 'rest_framework.exceptions.APIException: response')
+        self.assertEqual(group.count, 2)
+        self.assertEqual(group.first_seen, first.requested_at)
+        self.assertEqual(group.last_seen, second.requested_at)
+        self.assertEqual(group.sample_log, first)
+
+    @override_settings(DRF_TRACKING_ERROR_GROUP_FLUSH_INTERVAL=60)
+    def test_occurrences_coalesced(self):
+        errors._last_flush = time.time()
+        for i in range(3):
+            self.client.get('/bounded-errors-logging')
+        group = APIErrorGroup.objects.get()
+        self.assertEqual(group.count, 1)
+
+        errors.flush_error_groups('default')
+        group.refresh_from_db()
+        self.assertEqual(group.count, 3)
+        self.assertEqual(group.last_seen, APIRequestLog.objects.order_by('id').last().requested_at)
+
+    @override_settings(DRF_TRACKING_ERROR_GROUP_FLUSH_INTERVAL=60)
+    def test_deleted_group_created_again(self):
+        errors._last_flush = time.time()
+        self.client.get('/bounded-errors-logging')
+        APIErrorGroup.objects.all().delete()
+        self.client.get('/bounded-errors-logging')
+        self.client.get('/bounded-errors-logging')
+        errors.flush_error_groups('default')
+        group = APIErrorGroup.objects.get()
+        self.assertEqual(group.count, 2)
+        self.assertIn('Traceback', group.traceback)
+        first, second = APIRequestLog.objects.order_by('id')[1:]
+        self.assertEqual(group.first_seen, first.requested_at)
+        self.assertEqual(group.last_seen, second.requested_at)
+
+    def test_group_without_traceback_completed(self):
+        # created by a process which didn't get the traceback
+        log = APIRequestLog.objects.create(remote_addr='127.0.0.1', requested_at=now(), error_fingerprint='f' * 40)
+        errors.save_error_groups([log], 'default')
+        self.assertEqual(APIErrorGroup.objects.get().traceback, '')
+        errors.add_traceback('f' * 40, 'Traceback (most recent call last):')
+        errors.save_error_groups([log], 'default')
+        group = APIErrorGroup.objects.get()
+        self.assertEqual(group.traceback, 'Traceback (most recent call last):')
+        self.assertEqual(group.count, 2)
+
+    def test_traceback_truncated(self):
+        self.client.get('/bounded-errors-logging')
+        group = APIErrorGroup.objects.get()
+        self.assertEqual(group.traceback.count('  File '), 2)
+        self.assertIn('in get', group.traceback)
+
+    def test_full_capture_by_default(self):
+        self.client.get('/500-error-logging')
+        log = APIRequestLog.objects.first()
+        self.assertIn('Traceback', log.errors)
+        self.assertIsNone(log.error_fingerprint)
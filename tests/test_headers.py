@@ -0,0 +1,81 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import json
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_tracking import headers
+from rest_framework_tracking.mixins import BaseLoggingMixin, QueuedLoggingMixin, save_logs
+from rest_framework_tracking.models import APIHeaderValue, APIRequestLog
+from rest_framework_tracking.queues import BatchQueue
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+
+class TestGetMetaKey(SimpleTestCase):
+    def test_prefixed(self):
+        self.assertEqual(headers.get_meta_key('User-Agent'), 'HTTP_USER_AGENT')
+
+    def test_unprefixed(self):
+        self.assertEqual(headers.get_meta_key('Content-Type'), 'CONTENT_TYPE')
+
+
+class TestHeaderCapture(APITestCase):
+    def setUp(self):
+        headers.header_values.clear()
+
+    def test_allowed_headers_logged(self):
+        self.client.get('/headers-capture-logging', HTTP_USER_AGENT=USER_AGENT, HTTP_X_CLIENT_VERSION='1.2.3',
+                        HTTP_ACCEPT_LANGUAGE='fr')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.get_headers(), {'User-Agent': USER_AGENT, 'X-Client-Version': '1.2.3'})
+
+    def test_sensitive_headers_cleaned(self):
+        self.client.get('/headers-capture-logging', HTTP_AUTHORIZATION='Token 1234', HTTP_X_SECRET_ID='5678')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.get_headers(), {
+            'Authorization': BaseLoggingMixin.CLEANED_SUBSTITUTE,
+            'X-Secret-Id': BaseLoggingMixin.CLEANED_SUBSTITUTE,
+        })
+
+    def test_user_agent_interned(self):
+        self.client.get('/headers-capture-logging', HTTP_USER_AGENT=USER_AGENT)
+        self.client.post('/headers-capture-logging', {}, format='json', HTTP_USER_AGENT=USER_AGENT)
+        value = APIHeaderValue.objects.get()
+        self.assertEqual(value.value, USER_AGENT)
+        for log in APIRequestLog.objects.all():
+            self.assertEqual(json.loads(log.headers)['User-Agent'], value.pk)
+        post = APIRequestLog.objects.get(method='POST')
+        self.assertEqual(post.get_headers(), {'User-Agent': USER_AGENT})
+
+    def test_long_value_kept_inline(self):
+        user_agent = 'a' * 300
+        self.client.get('/headers-capture-logging', HTTP_USER_AGENT=user_agent)
+        log = APIRequestLog.objects.get()
+        self.assertEqual(json.loads(log.headers), {'User-Agent': user_agent})
+        self.assertEqual(APIHeaderValue.objects.count(), 0)
+
+    def test_no_headers_logged(self):
+        self.client.get('/logging', HTTP_USER_AGENT=USER_AGENT)
+        log = APIRequestLog.objects.get()
+        self.assertIsNone(log.headers)
+        self.assertEqual(log.get_headers(), {})
+
+    def test_queued_headers_logged(self):
+        log_queue = BatchQueue(save_logs, autostart=False)
+        with mock.patch.object(QueuedLoggingMixin, 'log_queue', log_queue):
+            self.client.get('/queued-headers-capture-logging', HTTP_USER_AGENT=USER_AGENT)
+        log_queue.flush()
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.get_headers(), {'User-Agent': USER_AGENT})
+
+    @mock.patch('django.db.transaction.on_commit', side_effect=lambda func, using=None: func())
+    def test_interned_id_cached(self, mock_on_commit):
+        pk = headers.header_values.get_id(USER_AGENT, 'default')
+        with self.assertNumQueries(0):
+            self.assertEqual(headers.header_values.get_id(USER_AGENT, 'default'), pk)
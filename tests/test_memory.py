@@ -0,0 +1,53 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_tracking.memory import AllocationTracker
+from rest_framework_tracking.models import APIRequestLog
+
+tracemalloc = pytest.importorskip('tracemalloc')
+
+MB = 1024 * 1024
+
+
+class TestMemoryTracking(APITestCase):
+    def test_allocations_recorded(self):
+        self.client.get('/memory-logging')
+        log = APIRequestLog.objects.get()
+        self.assertGreaterEqual(log.memory_peak, 4 * MB)
+        self.assertGreaterEqual(log.memory_net, MB)
+        self.assertLess(log.memory_net, 4 * MB)
+        self.assertIn('tests/views.py', log.memory_top)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_not_tracked_by_default(self):
+        self.client.get('/logging')
+        log = APIRequestLog.objects.get()
+        self.assertIsNone(log.memory_peak)
+        self.assertIsNone(log.memory_net)
+
+    def test_memory_by_view(self):
+        self.client.get('/memory-logging')
+        self.client.get('/memory-logging')
+        self.client.get('/logging')
+        rows = list(APIRequestLog.objects.memory_by_view())
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['view'], 'tests.views.MockMemoryLoggingView')
+        self.assertEqual(rows[0]['requests'], 2)
+        self.assertGreaterEqual(rows[0]['max_memory_peak'], 4 * MB)
+
+
+class TestAllocationTracker(SimpleTestCase):
+    def test_concurrent_peak_kept(self):
+        first = AllocationTracker()
+        first.start()
+        data = bytearray(4 * MB)
+        del data
+        second = AllocationTracker()
+        second.start()
+        second.stop()
+        first.stop()
+        self.assertGreaterEqual(first.peak, 4 * MB)
+        self.assertFalse(tracemalloc.is_tracing())
@@ -0,0 +1,36 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+from rest_framework.test import APITestCase
+from rest_framework_tracking.models import APIRequestLog
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+pytestmark = pytest.mark.django_db
+
+LABELS = {'view': 'tests.views.MockMetricsLoggingView', 'view_method': 'get'}
+
+
+def get_sample_value(name, labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics(APITestCase):
+    def test_request_counted_without_log(self):
+        labels = dict(LABELS, status='200')
+        before = get_sample_value('drf_tracking_requests_total', labels)
+        self.client.get('/metrics-logging')
+        self.assertEqual(get_sample_value('drf_tracking_requests_total', labels), before + 1)
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+    def test_latency_observed(self):
+        before = get_sample_value('drf_tracking_response_seconds_count', LABELS)
+        self.client.get('/metrics-logging')
+        self.assertEqual(get_sample_value('drf_tracking_response_seconds_count', LABELS), before + 1)
+
+    def test_metrics_view(self):
+        self.client.get('/metrics-logging')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'drf_tracking_requests_total{', response.content)
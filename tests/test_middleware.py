@@ -0,0 +1,115 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import ast
+import pytest
+from django.conf import settings
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_tracking import errors
+from rest_framework_tracking.mixins import BaseLoggingMixin, LoggingMixin
+from rest_framework_tracking.models import APIErrorGroup, APIRequestLog
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+pytestmark = pytest.mark.django_db
+
+MIDDLEWARE = ('rest_framework_tracking.middleware.LoggingMiddleware',) + tuple(settings.MIDDLEWARE)
+
+
+@override_settings(MIDDLEWARE=MIDDLEWARE, DRF_TRACKING_MIDDLEWARE_PATHS=[r'^/no-logging$', r'^/logging$'])
+class TestLoggingMiddlewarePaths(APITestCase):
+    def test_path_logged(self):
+        self.client.get('/no-logging', {'p1': 'a'})
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.path, '/no-logging')
+        self.assertEqual(log.view, 'tests.views.MockNoLoggingView')
+        self.assertEqual(log.view_method, 'get')
+        self.assertEqual(log.status_code, 200)
+        self.assertEqual(log.response, u'"no logging"')
+        self.assertEqual(ast.literal_eval(log.query_params), {u'p1': u'a'})
+
+    def test_data_cleaned(self):
+        self.client.post('/no-logging', {'password': '1234', 'val': 1}, format='json')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(ast.literal_eval(log.data), {
+            u'password': BaseLoggingMixin.CLEANED_SUBSTITUTE,
+            u'val': 1})
+
+    def test_unmatched_path_not_logged(self):
+        self.client.get('/json-logging')
+        self.assertEqual(APIRequestLog.objects.filter(view='tests.views.MockNoLoggingView').count(), 0)
+
+    def test_unresolved_path_not_logged(self):
+        with override_settings(DRF_TRACKING_MIDDLEWARE_PATHS=[r'^/no-logging']):
+            response = self.client.get('/no-logging/missing')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+    def test_mixin_view_logged_once(self):
+        self.client.get('/logging')
+        self.assertEqual(APIRequestLog.objects.count(), 1)
+
+    @mock.patch.object(BaseLoggingMixin, '_get_user_id', side_effect=RuntimeError('session lookup failed'))
+    def test_log_failure_not_raised(self, mock_get_user_id):
+        response = self.client.get('/no-logging')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, 'no logging')
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+
+@override_settings(MIDDLEWARE=MIDDLEWARE, DRF_TRACKING_MIDDLEWARE_VIEWS=['tests.views.MockNoLoggingView'])
+class TestLoggingMiddlewareViews(APITestCase):
+    def test_view_logged(self):
+        self.client.get('/no-logging')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.view, 'tests.views.MockNoLoggingView')
+        self.assertEqual(log.data, str({}))
+
+    def test_unresolved_path_not_logged(self):
+        response = self.client.get('/missing')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+    def test_other_view_not_logged(self):
+        self.client.get('/streaming-logging')
+        self.client.get('/no-logging')
+        self.assertEqual(APIRequestLog.objects.filter(path='/streaming-logging').count(), 1)
+        self.assertEqual(APIRequestLog.objects.count(), 2)
+
+
+@override_settings(MIDDLEWARE=MIDDLEWARE, DRF_TRACKING_MIDDLEWARE_PATHS=[r'^/no-logging-errors$'],
+                   DEBUG_PROPAGATE_EXCEPTIONS=False)
+class TestLoggingMiddlewareErrors(APITestCase):
+    def test_unhandled_exception(self):
+        with self.assertRaises(Exception):
+            self.client.post('/no-logging-errors')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 500)
+        self.assertIn('Exception: no logging', log.errors)
+        self.assertIn('Traceback', log.errors)
+
+    @mock.patch.object(LoggingMixin, 'exception_capture', errors.CAPTURE_BOUNDED)
+    def test_bounded_capture(self):
+        with self.assertRaises(Exception):
+            self.client.post('/no-logging-errors')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.errors, 'Exception: no logging')
+        self.assertEqual(APIErrorGroup.objects.get().fingerprint, log.error_fingerprint)
+
+    def test_handled_exception_without_handler(self):
+        self.client.get('/no-logging-errors')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 500)
+        self.assertIsNone(log.errors)
+
+    @override_settings(REST_FRAMEWORK={'EXCEPTION_HANDLER': 'rest_framework_tracking.middleware.exception_handler'})
+    def test_handled_exception(self):
+        response = self.client.get('/no-logging-errors')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data, {'detail': 'no logging'})
+        log = APIRequestLog.objects.get()
+        self.assertIn('APIException: no logging', log.errors)
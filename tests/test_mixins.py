@@ -6,6 +6,7 @@ import ast
 import datetime
 from io import BytesIO
 import json
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 from django.test.utils import override_settings
@@ -13,8 +14,8 @@ from flaky import flaky
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIRequestFactory, APITestCase
-from rest_framework_tracking.mixins import BaseLoggingMixin
-from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.mixins import BaseLoggingMixin, route_ids
+from rest_framework_tracking.models import APIRequestLog, APIRoute
 
 try:
     import mock
@@ -146,6 +147,47 @@ class TestLoggingMixin(APITestCase):
         log = APIRequestLog.objects.first()
         self.assertEqual(log.user, user)
 
+    def test_log_user_snapshot(self):
+        user = User.objects.create_user(username='myname', email='myname@example.com', password='secret')
+        self.client.login(username='myname', password='secret')
+        self.client.get('/user-snapshot-logging')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.user_id, user.pk)
+        self.assertEqual((log.username, log.user_email), ('myname', 'myname@example.com'))
+
+    def test_log_no_user_snapshot(self):
+        User.objects.create_user(username='myname', email='myname@example.com', password='secret')
+        self.client.login(username='myname', password='secret')
+        self.client.get('/session-auth-logging')
+        log = APIRequestLog.objects.get()
+        self.assertEqual((log.username, log.user_email), (None, None))
+
+    def test_session_user_id_checked(self):
+        user = User.objects.create_user(username='myname', password='secret')
+        self.client.login(username='myname', password='secret')
+        session = self.client.session
+        session[HASH_SESSION_KEY] = 'stale'
+        session.save()
+        self.client.get('/lazy-auth-logging')
+        self.client.login(username='myname', password='secret')
+        session = self.client.session
+        session[SESSION_KEY] = str(user.pk + 1)
+        session.save()
+        self.client.get('/lazy-auth-logging')
+        self.assertEqual(list(APIRequestLog.objects.values_list('user_id', flat=True)), [None, None])
+
+    def test_log_lazy_auth_user(self):
+        user = User.objects.create_user(username='myname', password='secret')
+        self.client.login(username='myname', password='secret')
+        route = APIRoute.objects.create(value='^lazy-auth-logging$')
+        route_ids._cache(('default', route.value), route.pk)
+        self.addCleanup(route_ids.clear)
+        # the session and the user of Django's authentication in the savepoint of ATOMIC_REQUESTS, then the log
+        with self.assertNumQueries(5):
+            response = self.client.get('/lazy-auth-logging')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(APIRequestLog.objects.get().user_id, user.pk)
+
     def test_log_auth_inactive_user(self):
         # set up inactive user with token
         user = User.objects.create_user(username='myname', password='secret')
@@ -313,6 +355,60 @@ class TestLoggingMixin(APITestCase):
         log = APIRequestLog.objects.first()
         self.assertIs(log.response, None)
 
+    def test_log_sizes(self):
+        payload = json.dumps({'val': 1})
+        self.client.post('/json-logging', payload, content_type='application/json')
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.request_size, len(payload))
+        self.assertEqual(log.response_size, len(log.response))
+        self.assertEqual(log.content_type, 'application/json')
+
+    def test_log_streaming_sizes(self):
+        self.client.get('/streaming-logging')
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.request_size, 0)
+        self.assertIsNone(log.response_size)
+
+    def test_log_unrendered_response(self):
+        response = MockLoggingView.as_view()(APIRequestFactory().get('/logging'))
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+        response.render()
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.response_size, len('"with logging"'))
+        self.assertEqual(log.response, '"with logging"')
+
+    @mock.patch.object(BaseLoggingMixin, '_get_response_size', side_effect=ValueError('bad Content-Length'))
+    def test_log_response_failure_not_raised(self, mock_get_response_size):
+        response = self.client.get('/logging')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, 'with logging')
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+    def test_bandwidth_by_view(self):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.client.post('/json-logging', json.dumps({'val': 'x' * 100}), content_type='application/json')
+        rows = list(APIRequestLog.objects.bandwidth_by_view())
+        self.assertEqual([row['view'] for row in rows], ['tests.views.MockLoggingView', 'tests.views.MockJSONLoggingView'])
+        self.assertEqual(rows[0]['requests'], 2)
+        self.assertEqual(rows[0]['response_bytes'], 2 * len('"with logging"'))
+        self.assertGreater(rows[1]['request_bytes'], 100)
+
+    def test_log_route(self):
+        self.client.get('/logging')
+        self.client.get('/logging', {'p1': 'a'})
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.route.value, '^logging$')
+        self.assertEqual(APIRoute.objects.count(), 1)
+
+    def test_by_route(self):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.client.get('/json-logging')
+        rows = list(APIRequestLog.objects.by_route())
+        self.assertEqual([(row['route__value'], row['requests']) for row in rows],
+                         [('^logging$', 2), ('^json-logging$', 1)])
+
     def test_log_status_validation_error(self):
         self.client.get('/validation-error-logging')
         log = APIRequestLog.objects.first()
@@ -333,6 +429,12 @@ class TestLoggingMixin(APITestCase):
         self.assertIn('response', log.response)
         self.assertIn('Traceback', log.errors)
 
+    def test_log_request_error_keeps_request_rollback(self):
+        self.client.post('/rollback-logging')
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.status_code, 500)
+        self.assertFalse(User.objects.filter(username='rolled-back').exists())
+
     def test_log_request_415_error(self):
         content_type = 'text/plain'
         self.client.post('/415-error-logging', {}, content_type=content_type)
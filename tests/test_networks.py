@@ -0,0 +1,87 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_tracking import networks
+from rest_framework_tracking.models import APIRequestLog
+
+
+class TestNetworkSet(SimpleTestCase):
+    def setUp(self):
+        self.network_set = networks.NetworkSet(['10.0.0.0/8', '192.168.1.0/24', '192.168.2.1', '2001:db8::/32'])
+
+    def test_contains(self):
+        self.assertIn('10.1.2.3', self.network_set)
+        self.assertIn('192.168.1.255', self.network_set)
+        self.assertIn('192.168.2.1', self.network_set)
+        self.assertIn('2001:db8::1', self.network_set)
+
+    def test_not_contains(self):
+        self.assertNotIn('11.0.0.1', self.network_set)
+        self.assertNotIn('192.168.2.2', self.network_set)
+        self.assertNotIn('2001:db9::1', self.network_set)
+        self.assertNotIn('not an address', self.network_set)
+
+    def test_compiled_once(self):
+        self.assertIs(networks.get_network_set(['10.0.0.0/8']), networks.get_network_set(['10.0.0.0/8']))
+
+
+class TestGetClientAddress(SimpleTestCase):
+    trusted = networks.NetworkSet(['10.0.0.0/8'])
+
+    def test_untrusted_peer(self):
+        self.assertEqual(networks.get_client_address('203.0.113.9', '198.51.100.1', self.trusted), '203.0.113.9')
+
+    def test_trusted_chain(self):
+        self.assertEqual(
+            networks.get_client_address('10.0.0.1', '198.51.100.1, 203.0.113.7, 10.0.0.2', self.trusted),
+            '203.0.113.7')
+
+    def test_all_trusted(self):
+        self.assertEqual(networks.get_client_address('10.0.0.1', '10.0.0.3, 10.0.0.2', self.trusted), '10.0.0.3')
+
+
+class TestPack(SimpleTestCase):
+    def test_ipv4_mapped(self):
+        self.assertEqual(networks.pack('192.0.2.1'), '00000000000000000000ffffc0000201')
+
+    def test_ipv6(self):
+        self.assertEqual(networks.pack('2001:db8::1'), '20010db8000000000000000000000001')
+
+    def test_invalid(self):
+        self.assertIsNone(networks.pack(''))
+
+    def test_range(self):
+        first, last = networks.get_packed_range('192.0.2.0/24')
+        self.assertEqual(first, networks.pack('192.0.2.0'))
+        self.assertEqual(last, networks.pack('192.0.2.255'))
+
+
+class TestTrustedProxies(APITestCase):
+    def test_forwarded_for_trusted_proxy(self):
+        self.client.get('/trusted-proxies-logging', REMOTE_ADDR='10.0.0.1',
+                        HTTP_X_FORWARDED_FOR='198.51.100.1, 203.0.113.7')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.remote_addr, '203.0.113.7')
+
+    def test_forwarded_for_untrusted_peer(self):
+        self.client.get('/trusted-proxies-logging', REMOTE_ADDR='203.0.113.9', HTTP_X_FORWARDED_FOR='198.51.100.1')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.remote_addr, '203.0.113.9')
+
+
+@override_settings(DRF_TRACKING_PACKED_IP=True)
+class TestPackedAddress(APITestCase):
+    def test_packed(self):
+        self.client.get('/logging', REMOTE_ADDR='192.0.2.1')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.remote_addr_packed, networks.pack('192.0.2.1'))
+
+    def test_from_network(self):
+        for address in ('192.0.2.1', '192.0.2.200', '192.0.3.1', '2001:db8::1'):
+            self.client.get('/logging', REMOTE_ADDR=address)
+        logs = APIRequestLog.objects.from_network('192.0.2.0/24')
+        self.assertEqual(sorted(log.remote_addr for log in logs), ['192.0.2.1', '192.0.2.200'])
+        self.assertEqual(APIRequestLog.objects.from_network('2001:db8::/32').get().remote_addr, '2001:db8::1')
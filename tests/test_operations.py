@@ -0,0 +1,77 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.operations import AlterIndexBySetting, get_index_names
+
+
+class TestAlterIndexBySetting(TransactionTestCase):
+    def setUp(self):
+        self.state = MigrationExecutor(connection).loader.project_state()
+        self.operation = AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='path',
+            index_name='drf_tracking_path',
+            setting='DRF_TRACKING_PATH_INDEX',
+            default=True,
+        )
+
+    def get_index_names(self, column='path'):
+        return get_index_names(connection, APIRequestLog._meta.db_table, column)
+
+    def migrate(self, backwards=False):
+        with connection.schema_editor() as schema_editor:
+            if backwards:
+                self.operation.database_backwards('rest_framework_tracking', schema_editor, self.state, self.state)
+            else:
+                self.operation.database_forwards('rest_framework_tracking', schema_editor, self.state, self.state)
+
+    def test_default_index_kept(self):
+        index_names = self.get_index_names()
+        self.assertTrue(index_names)
+        self.migrate()
+        self.assertEqual(self.get_index_names(), index_names)
+
+    @override_settings(DRF_TRACKING_PATH_INDEX=False)
+    def test_index_dropped_then_restored(self):
+        self.migrate()
+        self.assertEqual(self.get_index_names(), [])
+        self.migrate(backwards=True)
+        self.assertEqual(self.get_index_names(), ['drf_tracking_path'])
+
+    def test_state_unchanged(self):
+        state = self.state.clone()
+        self.operation.state_forwards('rest_framework_tracking', state)
+        self.assertTrue(state.apps.get_model('rest_framework_tracking', 'apirequestlog')._meta.get_field('path').db_index)
+
+    @override_settings(DRF_TRACKING_PACKED_IP=True)
+    def test_index_created_then_dropped(self):
+        self.operation = AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='remote_addr_packed',
+            index_name='drf_tracking_packed_ip',
+            setting='DRF_TRACKING_PACKED_IP',
+        )
+        self.assertEqual(self.get_index_names('remote_addr_packed'), [])
+        self.migrate()
+        self.assertEqual(self.get_index_names('remote_addr_packed'), ['drf_tracking_packed_ip'])
+        self.migrate(backwards=True)
+        self.assertEqual(self.get_index_names('remote_addr_packed'), [])
+
+    @override_settings(DRF_TRACKING_DIMENSION_TABLES=True)
+    def test_dimension_index_created(self):
+        self.operation = AlterIndexBySetting(
+            model_name='apirequestlog',
+            name='view_dimension',
+            index_name='drf_tracking_view_dim',
+            setting='DRF_TRACKING_DIMENSION_TABLES',
+        )
+        self.assertEqual(self.get_index_names('view_dimension_id'), [])
+        self.migrate()
+        self.assertEqual(self.get_index_names('view_dimension_id'), ['drf_tracking_view_dim'])
+        self.migrate(backwards=True)
+        self.assertEqual(self.get_index_names('view_dimension_id'), [])
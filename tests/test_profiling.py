@@ -0,0 +1,52 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import time
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_tracking.models import APIRequestLog, APIRequestProfile
+from rest_framework_tracking.profiling import Sampler, compress, decompress
+
+
+def busy_wait(seconds):
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        pass
+
+
+class TestSampler(SimpleTestCase):
+    def test_samples_calling_thread(self):
+        sampler = Sampler(interval=0.001)
+        sampler.start()
+        busy_wait(0.05)
+        sampler.stop()
+        self.assertGreater(sampler.samples, 0)
+        stack, count = sampler.folded().splitlines()[0].rsplit(' ', 1)
+        self.assertIn('busy_wait (', stack.split(';')[-1])
+        self.assertGreater(int(count), 0)
+
+    def test_compress(self):
+        self.assertEqual(decompress(compress(u'a;b 1')), u'a;b 1')
+
+
+class TestProfiledLogging(APITestCase):
+    def test_slow_request_profiled(self):
+        self.client.get('/profiled-logging')
+        profile = APIRequestProfile.objects.get()
+        self.assertEqual(profile.log, APIRequestLog.objects.get())
+        self.assertGreater(profile.samples, 0)
+        self.assertIn('get (', profile.get_folded_stacks())
+
+    def test_not_profiled_by_default(self):
+        self.client.get('/logging')
+        self.assertEqual(APIRequestProfile.objects.count(), 0)
+
+    def test_admin_download(self):
+        self.client.get('/profiled-logging')
+        log = APIRequestLog.objects.get()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        response = self.client.get('/admin/rest_framework_tracking/apirequestlog/{}/profile/'.format(log.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(response.content.decode('utf-8'), log.profile.get_folded_stacks())
@@ -0,0 +1,59 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_tracking.mixins import QueuedLoggingMixin, save_logs
+from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.queues import BatchQueue
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+
+class TestBatchQueue(SimpleTestCase):
+    def test_flush_in_batches(self):
+        batches = []
+        log_queue = BatchQueue(batches.append, batch_size=2, autostart=False)
+        for i in range(5):
+            log_queue.put(i)
+        log_queue.flush()
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
+
+    def test_put_drops_when_full(self):
+        log_queue = BatchQueue(list, maxsize=1, autostart=False)
+        self.assertTrue(log_queue.put(1))
+        self.assertFalse(log_queue.put(2))
+        self.assertEqual(log_queue.dropped, 1)
+
+    def test_handler_exception_is_swallowed(self):
+        handler = mock.Mock(side_effect=Exception('db failure'))
+        log_queue = BatchQueue(handler, autostart=False)
+        log_queue.put(1)
+        log_queue.flush()
+        handler.assert_called_once_with([1])
+
+
+class TestQueuedLoggingMixin(APITestCase):
+    def setUp(self):
+        self.log_queue = BatchQueue(save_logs, autostart=False)
+        patcher = mock.patch.object(QueuedLoggingMixin, 'log_queue', self.log_queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_log_written_on_flush(self):
+        self.client.get('/queued-logging')
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+        self.log_queue.flush()
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.path, '/queued-logging')
+        self.assertEqual(log.status_code, 200)
+
+    def test_error_log_written_on_flush(self):
+        self.client.post('/queued-logging')
+        self.log_queue.flush()
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.status_code, 500)
+        self.assertIn('Traceback', log.errors)
@@ -0,0 +1,163 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_tracking import errors, ringbuffer
+from rest_framework_tracking.management.commands import drf_tracking_flush
+from rest_framework_tracking.models import APIErrorGroup, APIRequestLog
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+
+class TestRingBuffer(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'ring')
+        self.buffer = ringbuffer.RingBuffer(self.path, size=256)
+        self.addCleanup(self.buffer.close)
+
+    def test_read_in_order(self):
+        for i in range(3):
+            self.assertTrue(self.buffer.put(b'record %d' % i))
+        records, position = self.buffer.read()
+        self.assertEqual(records, [b'record 0', b'record 1', b'record 2'])
+        self.buffer.commit(position)
+        self.assertEqual(self.buffer.read(), ([], position))
+
+    def test_read_batch(self):
+        for i in range(3):
+            self.buffer.put(b'record %d' % i)
+        records, position = self.buffer.read(max_records=2)
+        self.assertEqual(records, [b'record 0', b'record 1'])
+        self.buffer.commit(position)
+        self.assertEqual(self.buffer.read()[0], [b'record 2'])
+
+    def test_wrap_around(self):
+        for i in range(20):
+            self.assertTrue(self.buffer.put(b'x' * 40 + b'%02d' % i))
+            records, position = self.buffer.read()
+            self.assertEqual(records, [b'x' * 40 + b'%02d' % i])
+            self.buffer.commit(position)
+
+    def test_full(self):
+        while self.buffer.put(b'x' * 40):
+            pass
+        self.assertEqual(self.buffer.dropped, 1)
+        records, position = self.buffer.read()
+        self.buffer.commit(position)
+        self.assertTrue(self.buffer.put(b'x' * 40))
+
+    def test_shared_between_instances(self):
+        other = ringbuffer.RingBuffer(self.path)
+        self.addCleanup(other.close)
+        other.put(b'from another process')
+        self.assertEqual(other.capacity, 256)
+        self.assertEqual(self.buffer.read()[0], [b'from another process'])
+
+    def test_partial_record_skipped_when_stale(self):
+        self.buffer.put(b'first')
+        self.buffer.put(b'crashed')
+        self.buffer.put(b'last')
+        # the writer of the second record died before committing it
+        start = ringbuffer.HEADER_SIZE + 24
+        ringbuffer.RECORD_HEADER.pack_into(self.buffer._mmap, start, 7, 0, ringbuffer.WRITING, 0)
+        self.assertEqual(self.buffer.read(stale_timeout=60)[0], [b'first'])
+        self.assertEqual(self.buffer.read(stale_timeout=0)[0], [b'first', b'last'])
+
+    def test_corrupted_record_skipped(self):
+        self.buffer.put(b'first')
+        self.buffer.put(b'second')
+        self.buffer._mmap[ringbuffer.HEADER_SIZE + ringbuffer.RECORD_HEADER.size] = ord('F')
+        self.assertEqual(self.buffer.read()[0], [b'second'])
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_concurrent_processes(self):
+        path = self.path + '-large'
+        buffer = ringbuffer.RingBuffer(path, size=4096)
+        pids = []
+        for i in range(4):
+            pid = os.fork()
+            if pid == 0:
+                writer = ringbuffer.RingBuffer(path)
+                for j in range(3):
+                    writer.put(b'%d-%d' % (i, j))
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        records = buffer.read()[0]
+        buffer.close()
+        self.assertEqual(sorted(records), sorted(b'%d-%d' % (i, j) for i in range(4) for j in range(3)))
+
+
+@pytest.mark.django_db
+class TestRingBufferLoggingMixin(APITestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        override = override_settings(DRF_TRACKING_RING_BUFFER_PATH=os.path.join(directory, 'ring'))
+        override.enable()
+        self.addCleanup(override.disable)
+        ringbuffer._ring_buffer_pid = None
+        self.addCleanup(setattr, ringbuffer, '_ring_buffer_pid', None)
+
+    def test_log_written_by_flusher(self):
+        user = User.objects.create_user(username='myname', password='secret')
+        self.client.force_authenticate(user)
+        self.client.get('/ring-buffer-logging', {'p1': 'a'})
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+        call_command('drf_tracking_flush', '--once')
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log.path, '/ring-buffer-logging')
+        self.assertEqual(log.user, user)
+        self.assertEqual(log.query_params, str({'p1': 'a'}))
+        self.assertEqual(log.response, u'"with ring buffer"')
+        self.assertIsNotNone(log.requested_at)
+
+    def test_error_group_traceback_carried(self):
+        errors._tracebacks.clear()
+        self.client.post('/ring-buffer-logging')
+        self.client.post('/ring-buffer-logging')
+        # as in a flusher process
+        errors._tracebacks.clear()
+        errors._stored_fingerprints.clear()
+        call_command('drf_tracking_flush', '--once')
+        group = APIErrorGroup.objects.get()
+        self.assertIn('Traceback', group.traceback)
+        self.assertEqual(group.count, 2)
+
+    def test_flush_nothing(self):
+        call_command('drf_tracking_flush', '--once')
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+
+    def test_failing_log_skipped(self):
+        ringbuffer.get_ring_buffer().put(b'not a log')
+        self.client.get('/ring-buffer-logging')
+        call_command('drf_tracking_flush', '--once', '--max-attempts', '2', '--interval', '0')
+        self.assertEqual(APIRequestLog.objects.get().path, '/ring-buffer-logging')
+        self.assertEqual(ringbuffer.get_ring_buffer().read()[0], [])
+
+    def test_failing_database_not_skipped(self):
+        command = drf_tracking_flush.Command()
+        command.skipped = 0
+        with mock.patch.object(command, 'database_is_usable', return_value=False):
+            self.assertFalse(command.save_one_by_one([b'not a log']))
+        self.assertEqual(command.skipped, 0)
+
+    def test_single_flusher(self):
+        lock = ringbuffer.lock_reader(ringbuffer.get_ring_buffer().path)
+        self.addCleanup(os.close, lock)
+        with self.assertRaises(CommandError):
+            call_command('drf_tracking_flush', '--once')
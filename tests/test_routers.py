@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import override_settings
+from rest_framework_tracking.mixins import route_ids
+from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.routers import TrackingRouter, get_read_database, get_write_database
+
+
+class TestTrackingRouter(SimpleTestCase):
+    def setUp(self):
+        self.router = TrackingRouter()
+
+    def test_defaults(self):
+        self.assertEqual(get_write_database(), 'default')
+        self.assertEqual(get_read_database(), 'default')
+
+    @override_settings(DRF_TRACKING_DATABASE='logs')
+    def test_read_falls_back_to_write_database(self):
+        self.assertEqual(self.router.db_for_write(APIRequestLog), 'logs')
+        self.assertEqual(self.router.db_for_read(APIRequestLog), 'logs')
+
+    @override_settings(DRF_TRACKING_DATABASE='logs', DRF_TRACKING_READ_DATABASE='logs_replica')
+    def test_read_replica(self):
+        self.assertEqual(self.router.db_for_write(APIRequestLog), 'logs')
+        self.assertEqual(self.router.db_for_read(APIRequestLog), 'logs_replica')
+
+    @override_settings(DRF_TRACKING_DATABASE='logs')
+    def test_other_models_ignored(self):
+        self.assertIsNone(self.router.db_for_write(User))
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertIsNone(self.router.allow_migrate('logs', 'auth'))
+
+    @override_settings(DRF_TRACKING_DATABASE='logs')
+    def test_allow_migrate(self):
+        self.assertTrue(self.router.allow_migrate('logs', 'rest_framework_tracking'))
+        self.assertFalse(self.router.allow_migrate('default', 'rest_framework_tracking'))
+
+    def test_allow_relation_to_user(self):
+        self.assertTrue(self.router.allow_relation(APIRequestLog(), User()))
+        self.assertIsNone(self.router.allow_relation(User(), User()))
+
+
+@override_settings(DRF_TRACKING_DATABASE='logs', DATABASE_ROUTERS=['rest_framework_tracking.routers.TrackingRouter'])
+class TestLogsDatabase(TransactionTestCase):
+    # the logs database has its own, empty, user table
+    databases = {'default', 'logs'}
+    multi_db = True  # Django < 2.2
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='myname', password='secret')
+        self.client.login(username='myname', password='secret')
+        # the route ids cached by a test are gone with its rows
+        self.addCleanup(route_ids.clear)
+
+    def test_authenticated_request(self):
+        self.client.get('/logging')
+        self.assertFalse(APIRequestLog.objects.using('default').exists())
+        log = APIRequestLog.objects.get()
+        self.assertEqual(log._state.db, 'logs')
+        self.assertEqual(log.user, self.user)
+
+    def test_user_deleted(self):
+        self.client.get('/logging')
+        self.user.delete()
+        self.assertIsNone(APIRequestLog.objects.get().user_id)
@@ -0,0 +1,97 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import json
+import pytest
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils.timezone import now
+from rest_framework_tracking import serialization
+from rest_framework_tracking.serialization import LogRecord
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+
+class TestLogRecord(SimpleTestCase):
+    def setUp(self):
+        self.log = {
+            'requested_at': now(),
+            'user': User(pk=3),
+            'response_ms': 12,
+            'path': '/logging',
+            'remote_addr': '127.0.0.1',
+            'host': 'testserver',
+            'method': 'GET',
+            'query_params': {'p1': 'v1'},
+            'headers': {'User-Agent': 'test'},
+            'status_code': 200,
+        }
+
+    def test_from_log(self):
+        record = LogRecord.from_log(self.log)
+        self.assertEqual(record.user_id, 3)
+        self.assertEqual(record.query_params, {'p1': 'v1'})
+        self.assertEqual(record.headers, {'User-Agent': 'test'})
+        self.assertIsNone(record.errors)
+        self.assertEqual(record.to_log()['query_params'], "{'p1': 'v1'}")
+
+    def test_unknown_field(self):
+        with self.assertRaises(AssertionError):
+            LogRecord(path='/logging', nickname='alice')
+
+    def test_round_trip(self):
+        log = serialization.loads(serialization.dumps(self.log))
+        self.assertEqual(log, {
+            'requested_at': self.log['requested_at'],
+            'user_id': 3,
+            'response_ms': 12,
+            'path': '/logging',
+            'remote_addr': '127.0.0.1',
+            'host': 'testserver',
+            'method': 'GET',
+            'query_params': "{'p1': 'v1'}",
+            'headers': {'User-Agent': 'test'},
+            'status_code': 200,
+        })
+
+    def test_record_dumped(self):
+        record = LogRecord(requested_at=self.log['requested_at'], path='/logging')
+        self.assertEqual(serialization.loads(serialization.dumps(record)),
+                         {'requested_at': self.log['requested_at'], 'path': '/logging'})
+
+    def test_older_row(self):
+        row = LogRecord.from_log(self.log).to_row()[:5]
+        log = serialization.loads(json.dumps(row).encode('utf-8'))
+        self.assertEqual(log['path'], '/logging')
+        self.assertNotIn('status_code', log)
+
+    def test_large_integer(self):
+        self.log['data'] = {'n': 2 ** 70}
+        data = serialization.dumps(self.log)
+        self.assertEqual(serialization.loads(data)['data'], str({'n': 2 ** 70}))
+
+    def test_stdlib_json(self):
+        self.log['data'] = b'raw'
+        with mock.patch.object(serialization, 'orjson', None):
+            data = serialization.dumps(self.log)
+            log = serialization.loads(data)
+        self.assertEqual(log['user_id'], 3)
+        self.assertEqual(log['query_params'], "{'p1': 'v1'}")
+        self.assertEqual(log['data'], str(b'raw'))
+        self.assertEqual(serialization.loads(data), log)
+
+    @pytest.mark.skipif(serialization.msgpack is None, reason='msgpack is not installed')
+    def test_msgpack(self):
+        with override_settings(DRF_TRACKING_SERIALIZER='msgpack'):
+            data = serialization.dumps(self.log)
+        self.assertNotEqual(data[:1], b'[')
+        self.assertEqual(serialization.loads(data)['headers'], {'User-Agent': 'test'})
+
+    @override_settings(DRF_TRACKING_SERIALIZER='xml')
+    def test_unknown_serializer(self):
+        with self.assertRaises(AssertionError):
+            serialization.dumps(self.log)
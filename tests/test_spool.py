@@ -0,0 +1,210 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import override_settings
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_tracking import spool
+from rest_framework_tracking.mixins import save_logs_to_database
+from rest_framework_tracking.models import APIRequestLog
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def setUp(self):
+        self.breaker = spool.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.record_success())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+
+    @mock.patch('rest_framework_tracking.spool.time.time')
+    def test_half_open(self, mock_time):
+        mock_time.return_value = 1000
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        mock_time.return_value = 1031
+        self.assertTrue(self.breaker.allow())
+        # a single trial call
+        self.assertFalse(self.breaker.allow())
+        self.assertTrue(self.breaker.record_success())
+        self.assertTrue(self.breaker.allow())
+
+    @mock.patch('rest_framework_tracking.spool.time.time')
+    def test_half_open_failure(self, mock_time):
+        mock_time.return_value = 1000
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        mock_time.return_value = 1031
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow())
+
+
+class SpoolTestMixin(object):
+    def make_spool(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return spool.Spool(directory, fsync_interval=0)
+
+
+class TestSpool(SpoolTestMixin, SimpleTestCase):
+    def setUp(self):
+        self.spool = self.make_spool()
+        self.logs = [{'requested_at': now(), 'path': '/logging/%d' % i} for i in range(5)]
+
+    def test_replay(self):
+        self.spool.extend(self.logs[:2])
+        self.spool.extend(self.logs[2:])
+        saved = []
+        self.assertTrue(self.spool.replay(saved.append, batch_size=2))
+        self.assertEqual([len(batch) for batch in saved], [2, 2, 1])
+        self.assertEqual([log['path'] for batch in saved for log in batch], [log['path'] for log in self.logs])
+        self.assertEqual(os.listdir(self.spool.directory), [])
+
+    def test_failed_replay_spooled_again(self):
+        self.spool.extend(self.logs)
+        batches = []
+
+        def save(logs):
+            if batches:
+                raise OperationalError('db failure')
+            batches.append(logs)
+
+        self.assertFalse(self.spool.replay(save, batch_size=2))
+        self.assertTrue(self.spool.spooled)
+        saved = []
+        self.assertTrue(self.spool.replay(saved.append))
+        self.assertEqual([log['path'] for log in saved[0]], ['/logging/2', '/logging/3', '/logging/4'])
+
+    def test_failed_log_dropped(self):
+        self.spool.extend(self.logs)
+        saved = []
+
+        def save(logs):
+            if any(log['path'] == '/logging/1' for log in logs):
+                raise IntegrityError('bad log')
+            saved.extend(logs)
+
+        self.assertTrue(self.spool.replay(save, batch_size=2))
+        self.assertEqual([log['path'] for log in saved], ['/logging/0', '/logging/2', '/logging/3', '/logging/4'])
+        self.assertFalse(self.spool.spooled)
+
+    def test_database_failure_one_by_one(self):
+        self.spool.extend(self.logs)
+        saved = []
+
+        def save(logs):
+            if len(logs) > 1:
+                raise IntegrityError('bad log')
+            if logs[0]['path'] == '/logging/1':
+                raise OperationalError('db failure')
+            saved.extend(logs)
+
+        self.assertFalse(self.spool.replay(save, batch_size=2))
+        self.assertEqual([log['path'] for log in saved], ['/logging/0'])
+        saved = []
+        self.assertTrue(self.spool.replay(saved.extend, batch_size=5))
+        self.assertEqual([log['path'] for log in saved], ['/logging/1', '/logging/2', '/logging/3', '/logging/4'])
+
+    def test_partial_record_ignored(self):
+        self.spool.extend(self.logs[:2])
+        with open(self.spool.path, 'ab') as spool_file:
+            spool_file.write(spool._frame(b'{"cut": "short"}')[:-3])
+        saved = []
+        self.spool.replay(saved.append)
+        self.assertEqual(len(saved[0]), 2)
+
+    def test_live_process_file_left(self):
+        other = os.path.join(self.spool.directory, '{}{}'.format(os.getppid(), spool.SUFFIX))
+        open(other, 'wb').close()
+        self.spool.replay(lambda logs: None)
+        self.assertTrue(os.path.exists(other))
+
+    def test_dead_process_file_replayed(self):
+        pid = os.fork() if hasattr(os, 'fork') else None
+        if pid is None:
+            self.skipTest('requires fork')
+        if pid == 0:
+            self.spool.extend(self.logs[:1])
+            os._exit(0)
+        os.waitpid(pid, 0)
+        saved = []
+        self.spool.replay(saved.append)
+        self.assertEqual(len(saved[0]), 1)
+
+
+@pytest.mark.django_db
+class TestSpooledLogging(SpoolTestMixin, APITestCase):
+    def setUp(self):
+        self.spool = self.make_spool()
+        override = override_settings(DRF_TRACKING_SPOOL_DIR=self.spool.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        for patcher in (mock.patch.object(spool, '_spool', self.spool),
+                        mock.patch.object(spool, 'breaker', spool.CircuitBreaker(failure_threshold=2)),
+                        mock.patch.object(spool, '_start_replay')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch('rest_framework_tracking.models.APIRequestLog.save', side_effect=OperationalError('db failure'))
+    def test_log_spooled_on_failure(self, mock_save):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.client.get('/logging')
+        # the breaker opened after two failures
+        self.assertEqual(mock_save.call_count, 2)
+        mock_save.side_effect = None
+        mock_save.reset_mock()
+        self.assertEqual(APIRequestLog.objects.count(), 0)
+        call_command('drf_tracking_replay')
+        self.assertEqual(APIRequestLog.objects.filter(path='/logging').count(), 3)
+
+    def test_replay_started_after_recovery(self):
+        with mock.patch('rest_framework_tracking.models.APIRequestLog.save', side_effect=OperationalError('db failure')):
+            self.client.get('/logging')
+        self.assertFalse(spool._start_replay.called)
+        self.client.get('/logging')
+        self.assertTrue(spool._start_replay.called)
+        self.assertEqual(APIRequestLog.objects.count(), 1)
+
+    @mock.patch('rest_framework_tracking.models.APIRequestLog.save', side_effect=IntegrityError('bad log'))
+    def test_log_failure_not_spooled(self, mock_save):
+        self.client.get('/logging')
+        self.client.get('/logging')
+        self.client.get('/logging')
+        # the database works, the breaker stays closed
+        self.assertEqual(mock_save.call_count, 3)
+        self.assertFalse(self.spool.spooled)
+
+
+class TestReplayToDatabase(SpoolTestMixin, TransactionTestCase):
+    def test_failed_log_dropped(self):
+        self.spool = self.make_spool()
+        self.spool.extend([
+            {'requested_at': now(), 'path': '/logging/{}'.format(i), 'remote_addr': '127.0.0.1',
+             'host': 'testserver', 'method': 'GET', 'status_code': status_code}
+            for i, status_code in enumerate([-1, 200, 200])
+        ])
+        self.assertTrue(self.spool.replay(save_logs_to_database))
+        self.assertEqual(sorted(APIRequestLog.objects.values_list('path', flat=True)), ['/logging/1', '/logging/2'])
+        self.assertEqual(os.listdir(self.spool.directory), [])
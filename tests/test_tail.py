@@ -0,0 +1,121 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from six import StringIO
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_tracking import views
+from rest_framework_tracking.filters import LogFilters
+from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.tail import LogTail
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+pytestmark = pytest.mark.django_db
+
+
+def create_log(path='/logging', status_code=200, view='views.Logging', user=None):
+    return APIRequestLog.objects.create(
+        requested_at=now(), path=path, status_code=status_code, view=view, user=user,
+        remote_addr='127.0.0.1', host='testserver', method='GET',
+    )
+
+
+class TestLogTail(APITestCase):
+    def setUp(self):
+        self.tail = LogTail(autostart=False)
+
+    def test_new_logs_only(self):
+        create_log('/before')
+        watcher = self.tail.watch()
+        create_log('/after')
+        self.assertEqual(self.tail.poll(), 1)
+        self.assertEqual([log['path'] for log in watcher.get()], ['/after'])
+        self.assertEqual(self.tail.poll(), 0)
+        self.assertEqual(watcher.get(), [])
+
+    def test_filters(self):
+        user = User.objects.create_user('myname')
+        errors = self.tail.watch(LogFilters(status_codes=[500]))
+        users = self.tail.watch(LogFilters(user=user.pk, view='views.Logging'))
+        create_log('/error', status_code=500)
+        create_log('/user', user=user)
+        create_log('/other-view', view='views.Other', user=user)
+        self.tail.poll()
+        self.assertEqual([log['path'] for log in errors.get()], ['/error'])
+        self.assertEqual([log['path'] for log in users.get()], ['/user'])
+
+    def test_single_query_for_all_watchers(self):
+        watchers = [self.tail.watch() for i in range(10)]
+        create_log()
+        with self.assertNumQueries(1):
+            self.tail.poll()
+        for watcher in watchers:
+            self.assertEqual(len(watcher.get()), 1)
+
+    def test_unwatch(self):
+        watcher = self.tail.watch()
+        self.tail.unwatch(watcher)
+        create_log()
+        self.tail.poll()
+        self.assertEqual(watcher.get(), [])
+
+    def test_slow_watcher_drops(self):
+        watcher = self.tail.watch(maxsize=2)
+        for i in range(3):
+            create_log()
+        self.tail.poll()
+        self.assertEqual(len(watcher.get()), 2)
+        self.assertEqual(watcher.dropped, 1)
+
+
+class TestAPIRequestLogTailView(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        self.tail = LogTail(autostart=False)
+        patcher = mock.patch.object(views, 'log_tail', self.tail)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stream(self):
+        response = self.client.get('/logs/tail', {'status_code': '500'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        create_log('/ok')
+        log = create_log('/error', status_code=500)
+        self.tail.poll()
+        event = next(response.streaming_content).decode('utf-8')
+        self.assertTrue(event.startswith('id: {}\nevent: log\ndata: '.format(log.pk)))
+        self.assertIn('"path":"/error"', event)
+        response.close()
+        self.assertEqual(self.tail._watchers, set())
+
+    def test_last_event_id(self):
+        first = create_log('/first')
+        create_log('/missed')
+        response = self.client.get('/logs/tail', HTTP_LAST_EVENT_ID=str(first.pk))
+        self.assertIn('"path":"/missed"', next(response.streaming_content).decode('utf-8'))
+        response.close()
+
+    def test_admin_only(self):
+        self.client.force_authenticate(User.objects.create_user('user'))
+        response = self.client.get('/logs/tail')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.tail._watchers, set())
+
+
+class TestTailCommand(APITestCase):
+    def test_backlog(self):
+        create_log('/old')
+        create_log('/recent', status_code=500)
+        create_log('/last', status_code=500)
+        out = StringIO()
+        call_command('drf_tracking_tail', status_code='500', backlog=1, duration=0, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn(' 500 GET /last views.Logging ', lines[0])
@@ -0,0 +1,86 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import pytest
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_tracking import throttling
+from rest_framework_tracking.models import APIRequestLog
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+
+class TestSlidingWindowCounter(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.counter = throttling.SlidingWindowCounter(periods=(60,))
+
+    def test_count_current_window(self):
+        self.counter.incr('key', now=120)
+        self.counter.incr('key', now=130)
+        self.assertEqual(self.counter.count('key', 60, now=150), 2)
+
+    def test_previous_window_weighted(self):
+        for i in range(4):
+            self.counter.incr('key', now=110)
+        self.counter.incr('key', now=125)
+        # a quarter of the current window elapsed: 3/4 of the previous one counts
+        self.assertEqual(self.counter.count('key', 60, now=135), 1 + 4 * 0.75)
+
+    def test_old_windows_ignored(self):
+        self.counter.incr('key', now=10)
+        self.assertEqual(self.counter.count('key', 60, now=130), 0)
+
+    def test_keys_separated(self):
+        self.counter.incr('key', now=120)
+        self.assertEqual(self.counter.count('other', 60, now=130), 0)
+
+    def test_period_not_counted(self):
+        with self.assertRaises(AssertionError):
+            self.counter.count('key', 3600)
+
+    def test_one_round_trip_per_period(self):
+        self.counter.incr('key', now=120)
+        with mock.patch.object(self.counter.cache, 'add', wraps=self.counter.cache.add) as add:
+            self.counter.incr('key', now=130)
+        self.assertFalse(add.called)
+        self.assertEqual(self.counter.count('key', 60, now=150), 2)
+
+
+class TestDefaultPeriods(SimpleTestCase):
+    def test_throttle_rate_period(self):
+        with mock.patch.object(throttling.TrackingRateThrottle, 'THROTTLE_RATES', {'tracking': '1000/hour'}):
+            self.assertEqual(throttling.get_default_periods(), (3600,))
+
+    def test_without_throttle_rate(self):
+        with mock.patch.object(throttling.TrackingRateThrottle, 'THROTTLE_RATES', {}):
+            self.assertEqual(throttling.get_default_periods(), (60, 3600))
+
+
+@pytest.mark.django_db
+class TestTrackingRateThrottle(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_throttled(self):
+        self.assertEqual(self.client.get('/throttled-logging').status_code, 200)
+        self.assertEqual(self.client.get('/throttled-logging').status_code, 200)
+        response = self.client.get('/throttled-logging')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(APIRequestLog.objects.filter(status_code=429).count(), 1)
+
+    def test_counted_once(self):
+        self.client.get('/throttled-logging', REMOTE_ADDR='192.0.2.1')
+        self.assertEqual(throttling.get_request_counter().count('ip:192.0.2.1', 60), 1)
+
+    def test_quota_shared_with_mixin(self):
+        self.client.get('/rate-counted-logging', REMOTE_ADDR='192.0.2.1')
+        self.client.get('/rate-counted-logging', REMOTE_ADDR='192.0.2.1')
+        self.assertEqual(throttling.get_request_counter().count('ip:192.0.2.1', 60), 2)
+        self.assertEqual(self.client.get('/throttled-logging', REMOTE_ADDR='192.0.2.1').status_code, 429)
+        self.assertEqual(self.client.get('/throttled-logging', REMOTE_ADDR='192.0.2.2').status_code, 200)
@@ -0,0 +1,106 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import datetime
+import json
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.test.utils import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_tracking import tracing
+from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.queues import BatchQueue
+
+from .collector import OTLPCollector
+
+try:
+    import mock
+except Exception:
+    from unittest import mock
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+PARENT_SPAN_ID = '00f067aa0ba902b7'
+TRACEPARENT = '00-{}-{}-01'.format(TRACE_ID, PARENT_SPAN_ID)
+
+
+class TestTraceparent(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(tracing.parse_traceparent(TRACEPARENT), (TRACE_ID, PARENT_SPAN_ID))
+
+    def test_parse_invalid(self):
+        self.assertEqual(tracing.parse_traceparent(None), (None, None))
+        self.assertEqual(tracing.parse_traceparent('garbage'), (None, None))
+        self.assertEqual(tracing.parse_traceparent('00-{}-{}-01'.format('0' * 32, PARENT_SPAN_ID)), (None, None))
+        self.assertEqual(tracing.parse_traceparent('ff-{}-{}-01'.format(TRACE_ID, PARENT_SPAN_ID)), (None, None))
+
+    def test_build_span(self):
+        log = {
+            'trace_id': TRACE_ID, 'span_id': 'a' * 16, 'method': 'GET', 'path': '/logging', 'host': 'testserver',
+            'view': 'tests.views.MockLoggingView', 'view_method': 'get', 'status_code': 500, 'response_ms': 3,
+            'requested_at': datetime.datetime(2020, 1, 1, tzinfo=timezone.utc),
+        }
+        span = tracing.build_span(log, PARENT_SPAN_ID)
+        self.assertEqual(span['parentSpanId'], PARENT_SPAN_ID)
+        self.assertEqual(span['startTimeUnixNano'], '1577836800000000000')
+        self.assertEqual(span['endTimeUnixNano'], '1577836800003000000')
+        self.assertEqual(span['status'], {'code': tracing.STATUS_CODE_ERROR})
+
+    @override_settings(USE_TZ=False, TIME_ZONE='Europe/Paris')
+    def test_build_span_local_time(self):
+        log = {
+            'trace_id': TRACE_ID, 'span_id': 'a' * 16, 'method': 'GET', 'path': '/logging', 'host': 'testserver',
+            'status_code': 200, 'response_ms': 3, 'requested_at': datetime.datetime(2020, 1, 1, 1),
+        }
+        self.assertEqual(tracing.build_span(log)['startTimeUnixNano'], '1577836800000000000')
+
+    @override_settings(DRF_TRACKING_OTLP_ENDPOINT='http://localhost:4318/v1/traces')
+    @mock.patch('rest_framework_tracking.tracing.urlopen')
+    def test_export_spans(self, mock_urlopen):
+        tracing.export_spans([{'spanId': 'a' * 16}])
+        request = mock_urlopen.call_args[0][0]
+        self.assertEqual(request.get_full_url(), 'http://localhost:4318/v1/traces')
+        payload = json.loads(request.data.decode('utf-8'))
+        self.assertEqual(payload['resourceSpans'][0]['scopeSpans'][0]['spans'], [{'spanId': 'a' * 16}])
+
+
+class TestTracingMixin(APITestCase):
+    def test_trace_continued(self):
+        self.client.get('/logging', HTTP_TRACEPARENT=TRACEPARENT)
+        log = APIRequestLog.objects.first()
+        self.assertEqual(log.trace_id, TRACE_ID)
+        self.assertEqual(len(log.span_id), 16)
+        self.assertNotEqual(log.span_id, PARENT_SPAN_ID)
+
+    def test_trace_started(self):
+        self.client.get('/logging')
+        log = APIRequestLog.objects.first()
+        self.assertEqual(len(log.trace_id), 32)
+        self.assertEqual(len(log.span_id), 16)
+
+    def test_span_exported(self):
+        spans = []
+        with mock.patch.object(tracing, 'span_queue', BatchQueue(spans.extend, autostart=False)) as span_queue:
+            self.client.get('/tracing-logging', HTTP_TRACEPARENT=TRACEPARENT)
+            span_queue.flush()
+        log = APIRequestLog.objects.first()
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]['spanId'], log.span_id)
+        self.assertEqual(spans[0]['parentSpanId'], PARENT_SPAN_ID)
+
+    def test_spans_received_by_collector(self):
+        collector = OTLPCollector()
+        collector.start()
+        self.addCleanup(collector.stop)
+        span_queue = BatchQueue(tracing.export_spans, autostart=False)
+        with override_settings(DRF_TRACKING_OTLP_ENDPOINT=collector.endpoint, DRF_TRACKING_SERVICE_NAME='api'):
+            with mock.patch.object(tracing, 'span_queue', span_queue):
+                self.client.get('/tracing-logging', HTTP_TRACEPARENT=TRACEPARENT)
+                span_queue.flush()
+        self.assertEqual(collector.errors, [])
+        log = APIRequestLog.objects.first()
+        resource = collector.resource_spans[0]['resource']
+        self.assertEqual(resource['attributes'], [{'key': 'service.name', 'value': {'stringValue': 'api'}}])
+        span, = collector.spans
+        self.assertEqual((span['traceId'], span['spanId'], span['parentSpanId']), (TRACE_ID, log.span_id, PARENT_SPAN_ID))
+        attributes = {attribute['key']: attribute['value'] for attribute in span['attributes']}
+        self.assertEqual(attributes['http.status_code'], {'intValue': '200'})
@@ -0,0 +1,123 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import datetime
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+from rest_framework_tracking.models import APIRequestLog
+
+pytestmark = pytest.mark.django_db
+
+
+class TestAPIRequestLogViewSet(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        self.client.force_authenticate(self.admin)
+        self.start = now().replace(microsecond=0)
+        # pairs of logs at the same time, to page through ties
+        self.logs = APIRequestLog.objects.bulk_create([
+            APIRequestLog(
+                requested_at=self.start + datetime.timedelta(seconds=i // 2),
+                path='/logs/{}'.format(i),
+                view='views.{}'.format('Even' if i % 2 == 0 else 'Odd'),
+                status_code=500 if i % 5 == 0 else 200,
+                user=self.admin if i < 3 else None,
+                remote_addr='127.0.0.1',
+                host='testserver',
+                method='GET',
+            )
+            for i in range(10)
+        ])
+        self.ids = list(APIRequestLog.objects.order_by('-requested_at', '-id').values_list('id', flat=True))
+
+    def get_ids(self, response):
+        return [log['id'] for log in response.data['results']]
+
+    def test_admin_only(self):
+        self.client.force_authenticate(User.objects.create_user('user', password='secret'))
+        response = self.client.get('/logs/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_slim_fields(self):
+        response = self.client.get('/logs/')
+        self.assertEqual(set(response.data['results'][0]), {
+            'id', 'requested_at', 'user', 'method', 'path', 'view', 'view_method',
+            'status_code', 'response_ms', 'remote_addr',
+        })
+
+    def test_detail(self):
+        response = self.client.get('/logs/{}/'.format(self.ids[0]))
+        self.assertEqual(response.data['id'], self.ids[0])
+        self.assertEqual(response.data['headers'], {})
+
+    def test_pages(self):
+        ids = []
+        url = '/logs/?page_size=3'
+        while url:
+            # the page and the savepoint of ATOMIC_REQUESTS, however deep
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            ids.extend(self.get_ids(response))
+            url = response.data['next']
+        self.assertEqual(ids, self.ids)
+
+    def test_previous_page(self):
+        first = self.client.get('/logs/?page_size=3')
+        second = self.client.get(first.data['next'])
+        self.assertEqual(self.get_ids(second), self.ids[3:6])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(self.get_ids(previous), self.ids[:3])
+        self.assertIsNone(previous.data['previous'])
+        self.assertEqual(self.get_ids(self.client.get(previous.data['next'])), self.ids[3:6])
+
+    def get_page_sql(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        sql = [query['sql'] for query in queries if 'rest_framework_tracking_apirequestlog' in query['sql']]
+        return response, sql[0]
+
+    def test_page_bound(self):
+        # an index range bound besides the (requested_at, id) predicate
+        second, sql = self.get_page_sql(self.client.get('/logs/?page_size=3').data['next'])
+        self.assertIn('"requested_at" <= ', sql)
+        previous, sql = self.get_page_sql(second.data['previous'])
+        self.assertIn('"requested_at" >= ', sql)
+        self.assertEqual(self.get_ids(previous), self.ids[:3])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/logs/?cursor=bad')
+        self.assertEqual(response.status_code, 404)
+
+    def test_filters(self):
+        response = self.client.get('/logs/', {'view': 'views.Even', 'status_code': '500'})
+        self.assertEqual(sorted(log['path'] for log in response.data['results']), ['/logs/0'])
+        response = self.client.get('/logs/', {'status_code': '200,500', 'user': self.admin.pk})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_time_range(self):
+        response = self.client.get('/logs/', {
+            'since': (self.start + datetime.timedelta(seconds=1)).isoformat(),
+            'until': (self.start + datetime.timedelta(seconds=3)).isoformat(),
+        })
+        self.assertEqual(sorted(log['path'] for log in response.data['results']),
+                         ['/logs/2', '/logs/3', '/logs/4', '/logs/5'])
+
+    def test_invalid_filter(self):
+        self.assertEqual(self.client.get('/logs/', {'status_code': 'ok'}).status_code, 400)
+        self.assertEqual(self.client.get('/logs/', {'since': 'yesterday'}).status_code, 400)
+
+    def test_etag(self):
+        response = self.client.get('/logs/')
+        etag = response['ETag']
+        response = self.client.get('/logs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        APIRequestLog.objects.create(requested_at=self.start + datetime.timedelta(seconds=10), path='/logs/new',
+                                     remote_addr='127.0.0.1')
+        response = self.client.get('/logs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['path'], '/logs/new')
@@ -2,9 +2,12 @@
 from __future__ import absolute_import
 from . import views as test_views
 from rest_framework.routers import DefaultRouter
+from rest_framework_tracking.metrics import metrics_view
+from rest_framework_tracking.views import APIRequestLogTailView, APIRequestLogViewSet
 import django
 
 from django.conf.urls import url
+from django.contrib import admin
 
 if django.VERSION[0] == 1:
     from django.conf.urls import include
@@ -14,11 +17,19 @@ else:
 
 router = DefaultRouter()
 router.register(r'user', test_views.MockUserViewSet)
+router.register(r'logs', APIRequestLogViewSet)
 
 urlpatterns = [
     url(r'^no-logging$', test_views.MockNoLoggingView.as_view()),
+    url(r'^no-logging-errors$', test_views.MockNoLoggingErrorView.as_view()),
     url(r'^logging$', test_views.MockLoggingView.as_view()),
     url(r'^logging-exception$', test_views.MockLoggingView.as_view()),
+    url(r'^queued-logging$', test_views.MockQueuedLoggingView.as_view()),
+    url(r'^metrics-logging$', test_views.MockMetricsLoggingView.as_view()),
+    url(r'^metrics$', metrics_view),
+    url(r'^tracing-logging$', test_views.MockTracingLoggingView.as_view()),
+    url(r'^profiled-logging$', test_views.MockProfiledLoggingView.as_view()),
+    url(r'^memory-logging$', test_views.MockMemoryLoggingView.as_view()),
     url(r'^slow-logging$', test_views.MockSlowLoggingView.as_view()),
     url(r'^explicit-logging$', test_views.MockExplicitLoggingView.as_view()),
     url(r'^sensitive-fields-logging$', test_views.MockSensitiveFieldsLoggingView.as_view()),
@@ -30,6 +41,8 @@ urlpatterns = [
     url(r'^custom-log-handler$', test_views.MockCustomLogHandlerView.as_view()),
     url(r'^errors-logging$', test_views.MockLoggingErrorsView.as_view()),
     url(r'^session-auth-logging$', test_views.MockSessionAuthLoggingView.as_view()),
+    url(r'^lazy-auth-logging$', test_views.MockLazyAuthLoggingView.as_view()),
+    url(r'^user-snapshot-logging$', test_views.MockUserSnapshotLoggingView.as_view()),
     url(r'^token-auth-logging$', test_views.MockTokenAuthLoggingView.as_view()),
     url(r'^json-logging$', test_views.MockJSONLoggingView.as_view()),
     url(r'^multipart-logging$', test_views.MockMultipartLoggingView.as_view()),
@@ -37,9 +50,22 @@ urlpatterns = [
     url(r'^validation-error-logging$', test_views.MockValidationErrorLoggingView.as_view()),
     url(r'^404-error-logging$', test_views.Mock404ErrorLoggingView.as_view()),
     url(r'^500-error-logging$', test_views.Mock500ErrorLoggingView.as_view()),
+    url(r'^rollback-logging$', test_views.MockRollbackLoggingView.as_view()),
+    url(r'^bounded-errors-logging$', test_views.MockBoundedErrorsLoggingView.as_view()),
+    url(r'^metadata-logging$', test_views.MockMetadataLoggingView.as_view()),
+    url(r'^headers-logging$', test_views.MockHeadersLoggingView.as_view()),
+    url(r'^escalated-logging$', test_views.MockEscalatedLoggingView.as_view()),
+    url(r'^headers-capture-logging$', test_views.MockHeadersCaptureLoggingView.as_view()),
+    url(r'^queued-headers-capture-logging$', test_views.MockQueuedHeadersCaptureLoggingView.as_view()),
+    url(r'^trusted-proxies-logging$', test_views.MockTrustedProxiesLoggingView.as_view()),
+    url(r'^throttled-logging$', test_views.MockThrottledLoggingView.as_view()),
+    url(r'^rate-counted-logging$', test_views.MockRateCountedLoggingView.as_view()),
+    url(r'^ring-buffer-logging$', test_views.MockRingBufferLoggingView.as_view()),
     url(r'^415-error-logging$', test_views.Mock415ErrorLoggingView.as_view()),
     url(r'^no-view-log$', test_views.MockNameAPIView.as_view()),
     url(r'^view-log$', test_views.MockNameViewSet.as_view({'get': 'list'})),
     url(r'^400-body-parse-error-logging$', test_views.Mock400BodyParseErrorLoggingView.as_view()),
+    url(r'^admin/', admin.site.urls),
+    url(r'^logs/tail$', APIRequestLogTailView.as_view()),
     url(r'', include(router.urls))
 ]
@@ -6,9 +6,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import serializers, viewsets, mixins
-from rest_framework.exceptions import APIException
-from rest_framework_tracking.mixins import LoggingErrorsMixin, LoggingMixin
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework_tracking.mixins import LoggingErrorsMixin, LoggingMixin, QueuedLoggingMixin, RingBufferLoggingMixin
 from rest_framework_tracking.models import APIRequestLog
+from rest_framework_tracking.throttling import TrackingRateThrottle
 from tests.test_serializers import ApiRequestLogSerializer, UserSerializer
 import time
 
@@ -17,6 +18,17 @@ class MockNoLoggingView(APIView):
     def get(self, request):
         return Response('no logging')
 
+    def post(self, request):
+        return Response('no logging')
+
+
+class MockNoLoggingErrorView(APIView):
+    def get(self, request):
+        raise APIException('no logging')
+
+    def post(self, request):
+        raise Exception('no logging')
+
 
 class MockLoggingView(LoggingMixin, APIView):
     def get(self, request):
@@ -36,6 +48,49 @@ class MockLoggingExceptionView(LoggingMixin, APIView):
         return Response('with logging')
 
 
+class MockQueuedLoggingView(QueuedLoggingMixin, APIView):
+    def get(self, request):
+        return Response('with logging')
+
+    def post(self, request):
+        raise APIException('response')
+
+
+class MockMetricsLoggingView(LoggingMixin, APIView):
+    record_metrics = True
+    logging_methods = ['POST']
+
+    def get(self, request):
+        return Response('with metrics')
+
+
+class MockTracingLoggingView(LoggingMixin, APIView):
+    export_spans = True
+
+    def get(self, request):
+        return Response('with tracing')
+
+
+class MockProfiledLoggingView(LoggingMixin, APIView):
+    profile_sample_rate = 1
+    profile_threshold_ms = 0
+
+    def get(self, request):
+        time.sleep(0.05)
+        return Response('with profile')
+
+
+class MockMemoryLoggingView(LoggingMixin, APIView):
+    memory_sample_rate = 1
+    memory_top_threshold = 1024 * 1024
+
+    def get(self, request):
+        buffer = bytearray(4 * 1024 * 1024)
+        del buffer
+        self.kept = bytearray(1024 * 1024)
+        return Response('with memory tracking')
+
+
 class MockSlowLoggingView(LoggingMixin, APIView):
     def get(self, request):
         time.sleep(1)
@@ -146,6 +201,18 @@ class MockSessionAuthLoggingView(LoggingMixin, APIView):
         return Response('with session auth logging')
 
 
+class MockLazyAuthLoggingView(LoggingMixin, APIView):
+    def perform_authentication(self, request):
+        pass
+
+    def get(self, request):
+        return Response('with lazy auth logging')
+
+
+class MockUserSnapshotLoggingView(MockSessionAuthLoggingView):
+    snapshot_user = True
+
+
 class MockTokenAuthLoggingView(LoggingMixin, APIView):
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticated,)
@@ -188,6 +255,96 @@ class Mock500ErrorLoggingView(LoggingMixin, APIView):
         raise APIException('response')
 
 
+class MockRollbackLoggingView(LoggingMixin, APIView):
+    def post(self, request):
+        User.objects.create(username='rolled-back')
+        raise APIException('response')
+
+
+class MockBoundedErrorsLoggingView(LoggingMixin, APIView):
+    exception_capture = 'bounded'
+    traceback_depth = 2
+
+    def get(self, request):
+        raise APIException('response')
+
+    def post(self, request):
+        raise NotFound()
+
+
+class MockMetadataLoggingView(LoggingMixin, APIView):
+    capture_level = 'metadata'
+
+    def get(self, request):
+        if 'fail' in request.query_params:
+            raise APIException('failure')
+        if 'invalid' in request.query_params:
+            raise serializers.ValidationError('invalid')
+        return Response('with metadata')
+
+    def post(self, request):
+        return Response('with metadata')
+
+
+class MockHeadersLoggingView(MockMetadataLoggingView):
+    capture_level = 'headers'
+
+
+class MockEscalatedLoggingView(MockMetadataLoggingView):
+    capture_escalate_ms = 0
+
+
+class MockHeadersCaptureLoggingView(LoggingMixin, APIView):
+    logged_headers = ('User-Agent', 'X-Client-Version', 'Authorization', 'X-Secret-Id')
+    sensitive_fields = {'x-secret-id'}
+
+    def get(self, request):
+        return Response('with headers')
+
+    def post(self, request):
+        return Response('with headers')
+
+
+class MockQueuedHeadersCaptureLoggingView(QueuedLoggingMixin, MockHeadersCaptureLoggingView):
+    pass
+
+
+class MockTrustedProxiesLoggingView(LoggingMixin, APIView):
+    trusted_proxies = ['10.0.0.0/8', '2001:db8::/32']
+
+    def get(self, request):
+        return Response('with trusted proxies')
+
+
+class MockTrackingRateThrottle(TrackingRateThrottle):
+    rate = '2/min'
+
+
+class MockThrottledLoggingView(LoggingMixin, APIView):
+    throttle_classes = (MockTrackingRateThrottle,)
+    count_rate = True
+
+    def get(self, request):
+        return Response('with throttling')
+
+
+class MockRateCountedLoggingView(LoggingMixin, APIView):
+    count_rate = True
+
+    def get(self, request):
+        return Response('with rate counting')
+
+
+class MockRingBufferLoggingView(RingBufferLoggingMixin, APIView):
+    exception_capture = 'bounded'
+
+    def get(self, request):
+        return Response('with ring buffer')
+
+    def post(self, request):
+        raise APIException('with ring buffer')
+
+
 class Mock415ErrorLoggingView(LoggingMixin, APIView):
     def post(self, request):
         return request.data